@@ -57,6 +57,8 @@ class Settings(BaseSettings):
     # Audio Processing
     AUDIO_SAMPLE_RATE: int = 16000
     MAX_AUDIO_DURATION: int = 60  # seconds
+    TTS_WARMUP: bool = True  # Synthesize a test phrase at startup (network call to Edge TTS)
+    TTS_CACHE_DIR: str = str(BASE_DIR / "data" / "tts_cache")  # Synthesized audio, kept private (0700)
     
     # Inference
     MAX_INFERENCE_TIME: float = 2.0  # seconds
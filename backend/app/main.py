@@ -2,6 +2,7 @@ from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
+import asyncio
 import time
 import logging
 from dotenv import load_dotenv
@@ -12,6 +13,8 @@ load_dotenv()
 from app.config import settings
 from app.utils.database import db
 from app.utils.logging_config import setup_logging
+from app.services.speech.tts_service import tts_service
+from app.services.symptom_analyzer.analyzer import get_symptom_analyzer
 from app.routes import conversation_routes, user_routes, vitals_routes, health_routes, image_routes, drug_routes, tts_routes, profile_routes, autocomplete_routes, session_routes, whatsapp_routes, auth_routes
 from app.routes import prescription_routes, prescription_qa_routes, prescription_reminder_routes
 from app.routes import google_fit_routes
@@ -34,6 +37,12 @@ async def lifespan(app: FastAPI):
         logger.warning(f"PostgreSQL connection failed, using in-memory storage: {e}")
         await db.connect_db(None, None)  # Force in-memory mode
     
+    # Load the medical knowledge graph once, before serving requests
+    get_symptom_analyzer()
+    
+    # Warm up Edge TTS in the background so startup isn't blocked on the network
+    tts_warmup = asyncio.create_task(tts_service.warmup()) if settings.TTS_WARMUP else None
+    
     # TODO: Initialize ML models
     # TODO: Connect to MQTT broker
     # TODO: Start Prometheus metrics server
@@ -44,6 +53,9 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("Shutting down application...")
+    if tts_warmup is not None:
+        tts_warmup.cancel()
+    await tts_service.shutdown()
     await db.close_db()
     logger.info("Application shutdown complete")
 
@@ -1,4 +1,5 @@
-from pydantic import BaseModel, Field
+import sys
+from pydantic import BaseModel, Field, field_validator
 from typing import Optional, List, Dict
 from datetime import datetime
 from enum import Enum
@@ -61,6 +62,12 @@ class ExtractedSymptom(BaseModel):
     severity: Optional[str] = None  # mild, moderate, severe
     duration: Optional[str] = None  # "2 days", "since morning"
     confidence: float = Field(ge=0, le=1)
+    
+    @field_validator("name", mode="after")
+    @classmethod
+    def _intern_name(cls, value: str) -> str:
+        """Intern symptom keys - they are hashed into sets/dicts throughout analysis"""
+        return sys.intern(value)
 
 
 class EmotionAnalysis(BaseModel):
@@ -9,12 +9,36 @@ Stores:
 - AI context for personalized responses
 """
 
-from datetime import datetime
-from typing import Dict, List, Optional, Any
-from pydantic import BaseModel, Field
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from itertools import islice
+from typing import Deque, Dict, List, Optional, Any
+from pydantic import BaseModel, Field, PrivateAttr, field_validator, model_validator
 from enum import Enum
 
 
+_EPOCH = datetime(1970, 1, 1)
+
+# Number of past consultations kept on a profile
+MAX_CONSULTATION_HISTORY = 20
+
+
+def utc_now_us() -> int:
+    """Current UTC time as integer epoch microseconds"""
+    return time.time_ns() // 1000
+
+
+def epoch_us_to_datetime(epoch_us: int) -> datetime:
+    """Convert epoch microseconds to a naive UTC datetime"""
+    return _EPOCH + timedelta(microseconds=epoch_us)
+
+
+def datetime_to_epoch_us(value: datetime) -> int:
+    """Convert a naive UTC datetime to epoch microseconds"""
+    return (value - _EPOCH) // timedelta(microseconds=1)
+
+
 class Gender(str, Enum):
     MALE = "male"
     FEMALE = "female"
@@ -113,7 +137,9 @@ class UserProfile(BaseModel):
     exercise_frequency: Optional[str] = None  # none, occasional, regular, daily
     
     # Past consultations with CMC Health
-    consultation_history: List[PastConsultation] = []
+    consultation_history: Deque[PastConsultation] = Field(
+        default_factory=lambda: deque(maxlen=MAX_CONSULTATION_HISTORY)
+    )
     
     # Symptom patterns (for AI context)
     recurring_symptoms: List[str] = []  # Symptoms that appear frequently
@@ -124,13 +150,53 @@ class UserProfile(BaseModel):
     
     # Metadata
     created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at_us: int = Field(default_factory=utc_now_us)  # epoch microseconds
     last_consultation: Optional[datetime] = None
     total_consultations: int = 0
     
     # Profile completeness (0-100)
     profile_completeness: int = 0
     
+    # Lowercase name -> list index, used for O(1) duplicate checks
+    _allergen_index: Dict[str, int] = PrivateAttr(default_factory=dict)
+    _condition_index: Dict[str, int] = PrivateAttr(default_factory=dict)
+    _medication_index: Dict[str, int] = PrivateAttr(default_factory=dict)
+    
+    @model_validator(mode="before")
+    @classmethod
+    def _convert_legacy_updated_at(cls, data: Any) -> Any:
+        """Accept the older `updated_at` datetime/ISO value in place of updated_at_us"""
+        if isinstance(data, dict) and "updated_at" in data:
+            data = dict(data)
+            updated_at = data.pop("updated_at")
+            if updated_at and "updated_at_us" not in data:
+                if isinstance(updated_at, str):
+                    updated_at = datetime.fromisoformat(updated_at)
+                data["updated_at_us"] = datetime_to_epoch_us(updated_at)
+        return data
+    
+    @field_validator("consultation_history", mode="after")
+    @classmethod
+    def _bound_consultation_history(cls, value: Deque[PastConsultation]) -> Deque[PastConsultation]:
+        """Keep only the most recent consultations; appends evict the oldest"""
+        return deque(value, maxlen=MAX_CONSULTATION_HISTORY)
+    
+    def recent_consultations(self, limit: int) -> List[PastConsultation]:
+        """Return the last `limit` consultations, oldest first"""
+        start = max(len(self.consultation_history) - limit, 0)
+        return list(islice(self.consultation_history, start, None))
+    
+    @property
+    def updated_at(self) -> datetime:
+        """Last update time as a naive UTC datetime"""
+        return epoch_us_to_datetime(self.updated_at_us)
+    
+    def model_post_init(self, __context: Any) -> None:
+        """Build the duplicate-check indexes from the validated lists"""
+        self._allergen_index = {a.allergen.lower(): i for i, a in enumerate(self.allergies)}
+        self._condition_index = {c.name.lower(): i for i, c in enumerate(self.medical_conditions)}
+        self._medication_index = {m.name.lower(): i for i, m in enumerate(self.current_medications)}
+    
     def calculate_completeness(self) -> int:
         """Calculate how complete the profile is"""
         score = 0
@@ -276,7 +342,7 @@ class UserProfile(BaseModel):
         
         # Previous consultations summary
         if self.consultation_history:
-            recent = self.consultation_history[-3:]  # Last 3 consultations
+            recent = self.recent_consultations(3)  # Last 3 consultations
             recent_conditions = []
             for c in recent:
                 recent_conditions.extend(c.conditions_suggested)
@@ -307,9 +373,11 @@ class UserProfile(BaseModel):
                         urgency_level: str, conditions: List[str] = [],
                         medications: List[str] = [], summary: str = ""):
         """Add a consultation to history"""
+        now_us = utc_now_us()
+        now = epoch_us_to_datetime(now_us)
         consultation = PastConsultation(
             session_id=session_id,
-            date=datetime.utcnow(),
+            date=now,
             symptoms=symptoms,
             urgency_level=urgency_level,
             conditions_suggested=conditions,
@@ -317,7 +385,7 @@ class UserProfile(BaseModel):
             ai_response_summary=summary
         )
         self.consultation_history.append(consultation)
-        self.last_consultation = datetime.utcnow()
+        self.last_consultation = now
         self.total_consultations += 1
         
         # Update symptom frequency
@@ -328,7 +396,7 @@ class UserProfile(BaseModel):
             if self.symptom_frequency[symptom] >= 3 and symptom not in self.recurring_symptoms:
                 self.recurring_symptoms.append(symptom)
         
-        self.updated_at = datetime.utcnow()
+        self.updated_at_us = now_us
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for storage/API"""
@@ -255,9 +255,10 @@ async def send_message(request: MessageRequest):
                     language=request.language
                 )
                 if db_session:
-                    # Restore session to in-memory dict
-                    restored_messages = db_session.get("messages", [])
-                    restored_symptoms = db_session.get("symptoms", [])
+                    # Restore session to in-memory dict; copies, since these
+                    # lists are appended to and may be the stored ones
+                    restored_messages = list(db_session.get("messages", []))
+                    restored_symptoms = list(db_session.get("symptoms", []))
                     
                     sessions[request.session_id] = {
                         "user_id": db_session.get("user_phone") or db_session.get("phone_number", ""),
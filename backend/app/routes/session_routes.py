@@ -13,7 +13,7 @@ Features:
 
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Mapping
 from datetime import datetime
 import uuid
 import logging
@@ -342,10 +342,13 @@ async def delete_session(session_id: str, user_id: Optional[str] = None, user_ph
 # Helper functions for conversation integration
 # ============================================
 
-async def get_or_create_session(user_phone: str, session_id: str = None, language: str = "en") -> Dict[str, Any]:
+async def get_or_create_session(user_phone: str, session_id: str = None, language: str = "en") -> Mapping[str, Any]:
     """
     Get existing session or create new one
     Used by conversation routes to link messages to sessions
+    
+    An in-memory session comes back as a read-only view sharing its nested
+    lists with the store; copy "messages"/"symptoms" before editing them.
     """
     # Use PostgreSQL if available
     if POSTGRES_SESSIONS_AVAILABLE:
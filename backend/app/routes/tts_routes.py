@@ -9,23 +9,17 @@ Features:
 """
 
 from fastapi import APIRouter, HTTPException
-from fastapi.responses import Response
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel
 from typing import Optional, Literal
 import logging
 
-from ..services.speech.tts_service import TTSService
+from ..services.speech.tts_service import tts_service
 
 router = APIRouter(prefix="/tts", tags=["text-to-speech"])
 logger = logging.getLogger(__name__)
 
-tts_service = TTSService()
-
-# Simple in-memory cache to prevent duplicate TTS generation
-# Key: hash of (text, language, gender, speed) → audio bytes
-from hashlib import md5
-_tts_cache: dict[str, bytes] = {}
-_TTS_CACHE_MAX = 50  # Keep last 50 entries
+# Repeat phrases are served from tts_service's synthesis cache
 _TTS_MAX_TEXT_LENGTH = 1000  # Max chars for TTS (generous for non-Latin scripts like Tamil)
 
 
@@ -37,6 +31,25 @@ class TTSRequest(BaseModel):
     speed: Optional[Literal["fast", "normal", "slow", "very_slow"]] = None  # Speed control
 
 
+def _prepare_text(request: TTSRequest, label: str) -> str:
+    """Validate, strip and length-cap the request text, logging the request"""
+    text = request.text.strip()
+    if not text:
+        raise HTTPException(status_code=400, detail="Text is required")
+    
+    # Truncate very long text to prevent slow TTS generation
+    if len(text) > _TTS_MAX_TEXT_LENGTH:
+        text = text[:_TTS_MAX_TEXT_LENGTH] + "..."
+    
+    logger.info(
+        f"{label}: lang={request.language}, "
+        f"gender={request.gender or 'female'}, "
+        f"speed={request.speed or 'normal'}, "
+        f"text_length={len(text)}"
+    )
+    return text
+
+
 @router.post("/speak")
 async def text_to_speech(request: TTSRequest):
     """
@@ -58,32 +71,9 @@ async def text_to_speech(request: TTSRequest):
         - Slow for elderly: {"text": "Take medicine", "language": "en", "speed": "very_slow"}
     """
     try:
-        if not request.text.strip():
-            raise HTTPException(status_code=400, detail="Text is required")
-        
-        # Truncate very long text to prevent slow TTS generation
-        text = request.text.strip()
-        if len(text) > _TTS_MAX_TEXT_LENGTH:
-            text = text[:_TTS_MAX_TEXT_LENGTH] + "..."
+        text = _prepare_text(request, "TTS request")
         
-        logger.info(
-            f"TTS request: lang={request.language}, "
-            f"gender={request.gender or 'female'}, "
-            f"speed={request.speed or 'normal'}, "
-            f"text_length={len(text)}"
-        )
-        
-        # Check cache first
-        cache_key = md5(f"{text}|{request.language}|{request.gender}|{request.speed}".encode()).hexdigest()
-        if cache_key in _tts_cache:
-            logger.info(f"TTS cache hit for {cache_key[:8]}")
-            return Response(
-                content=_tts_cache[cache_key],
-                media_type="audio/mpeg",
-                headers={"Content-Disposition": "inline; filename=speech.mp3"}
-            )
-        
-        # Generate speech using Edge TTS
+        # Generate speech using Edge TTS (cached by the service)
         audio_bytes = await tts_service.generate_speech_bytes_async(
             text=text,
             language=request.language,
@@ -95,12 +85,6 @@ async def text_to_speech(request: TTSRequest):
         if not audio_bytes:
             raise HTTPException(status_code=500, detail="Failed to generate speech")
         
-        # Store in cache (evict oldest if full)
-        if len(_tts_cache) >= _TTS_CACHE_MAX:
-            oldest_key = next(iter(_tts_cache))
-            del _tts_cache[oldest_key]
-        _tts_cache[cache_key] = audio_bytes
-        
         return Response(
             content=audio_bytes,
             media_type="audio/mpeg",
@@ -115,6 +99,45 @@ async def text_to_speech(request: TTSRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/stream")
+async def text_to_speech_stream(request: TTSRequest):
+    """
+    Stream speech as MP3 chunks while Edge TTS synthesizes it.
+    
+    Same options as /speak; playback can start on the first chunk.
+    """
+    text = _prepare_text(request, "TTS stream request")
+    
+    audio = tts_service.stream_speech_async(
+        text=text,
+        language=request.language,
+        slow=request.slow,
+        gender=request.gender,
+        speed=request.speed
+    )
+    
+    # Wait for the first chunk so a synthesis that fails (or produces
+    # nothing) gets a 500 like /speak instead of an empty 200
+    try:
+        first_chunk = await anext(audio, None)
+    except Exception as e:
+        logger.error(f"TTS stream error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+    if first_chunk is None:
+        raise HTTPException(status_code=500, detail="Failed to generate speech")
+    
+    async def body():
+        yield first_chunk
+        async for chunk in audio:
+            yield chunk
+    
+    return StreamingResponse(
+        body(),
+        media_type="audio/mpeg",
+        headers={"Content-Disposition": "inline; filename=speech.mp3"}
+    )
+
+
 @router.get("/voices")
 async def get_available_voices():
     """
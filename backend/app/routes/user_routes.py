@@ -52,10 +52,8 @@ async def get_user(user_id: str):
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
         
-        # Remove MongoDB _id field
-        user.pop('_id', None)
-        
-        return UserProfile(**user)
+        # Remove MongoDB _id field (the stored doc is read-only)
+        return UserProfile(**{k: v for k, v in user.items() if k != '_id'})
         
     except HTTPException:
         raise
@@ -64,11 +64,10 @@ async def get_latest_vitals(user_id: str) -> VitalsReading:
         if not vitals:
             raise HTTPException(status_code=404, detail="No vitals found for user")
         
-        # Remove MongoDB _id
-        vitals.pop('_id', None)
-        vitals.pop('user_id', None)
-        
-        return VitalsReading(**vitals)
+        # Drop MongoDB _id and the owning user (the stored doc is read-only)
+        return VitalsReading(**{
+            k: v for k, v in vitals.items() if k not in ('_id', 'user_id')
+        })
         
     except HTTPException:
         raise
@@ -90,9 +89,9 @@ async def get_vitals_history(user_id: str, limit: int = 100):
         
         vitals_list = []
         async for vitals in cursor:
-            vitals.pop('_id', None)
-            vitals.pop('user_id', None)
-            vitals_list.append(VitalsReading(**vitals))
+            vitals_list.append(VitalsReading(**{
+                k: v for k, v in vitals.items() if k not in ('_id', 'user_id')
+            }))
         
         return {"vitals": vitals_list, "count": len(vitals_list)}
         
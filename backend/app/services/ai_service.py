@@ -310,7 +310,7 @@ class AIService:
             },
             "mental_health": {
                 "detected": mental_health.get("has_mental_health_content", False),
-                "categories": mental_health.get("categories", []),
+                "categories": list(mental_health.get("categories", [])),
                 "severity": mental_health.get("severity", "low"),
                 "is_crisis": mental_health.get("is_crisis", False),
                 "resources": self._format_resources(mental_health.get("resources", [])),
@@ -318,7 +318,7 @@ class AIService:
                 "breathing_exercise": mental_health.get("breathing_exercise")
             },
             "requires_immediate_attention": analysis.get("requires_immediate_attention", False),
-            "follow_up_questions": mental_health.get("follow_up_questions", []),
+            "follow_up_questions": list(mental_health.get("follow_up_questions", [])),
             # New: Dynamic medicine evaluation data
             "medicine_evaluation": {
                 "possible_conditions": medicine_evaluation.get("possible_conditions", []) if medicine_evaluation else [],
@@ -15,7 +15,7 @@ from app.models.schemas import (
 from app.services.nlp.language_detector import language_detector
 from app.services.nlp.translator import translation_service
 from app.services.nlp.symptom_extractor import symptom_extractor
-from app.services.symptom_analyzer.analyzer import symptom_analyzer
+from app.services.symptom_analyzer.analyzer import get_symptom_analyzer
 from app.services.speech.tts_service import tts_service
 
 logger = logging.getLogger(__name__)
@@ -58,7 +58,7 @@ class ConversationHandler:
             logger.info(f"Extracted {len(symptoms)} symptoms")
             
             # Step 4: Analyze symptoms and generate diagnosis
-            diagnosis = symptom_analyzer.analyze(
+            diagnosis = get_symptom_analyzer().analyze(
                 symptoms=symptoms,
                 vitals=vitals,
                 emotion_stress=0.0  # TODO: Add emotion detection
@@ -169,7 +169,7 @@ class ConversationHandler:
             clean_text = clean_text.replace('🚨', '').replace('⚠️', '').replace('📅', '').replace('⚕️', '')
             
             # Generate audio
-            audio_path = tts_service.generate_speech(clean_text, language)
+            audio_path = await tts_service.generate_speech_async(clean_text, language)
             logger.info(f"Generated voice response: {audio_path}")
             
             return audio_path
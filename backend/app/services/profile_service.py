@@ -14,7 +14,13 @@ Now uses PostgreSQL for persistent storage!
 import logging
 import json
 import hashlib
-from datetime import datetime
+import mmap
+import operator
+import os
+import shutil
+import threading
+import time
+from collections import OrderedDict
 from typing import Dict, Optional, List, Any, Tuple
 from pathlib import Path
 
@@ -26,7 +32,9 @@ from ..models.user_profile import (
     EmergencyContact,
     Gender,
     BloodType,
-    PastConsultation
+    PastConsultation,
+    utc_now_us,
+    epoch_us_to_datetime
 )
 
 # Try to import PostgreSQL service
@@ -41,6 +49,125 @@ except ImportError as e:
     logger.warning(f"⚠️ PostgreSQL not available, using in-memory storage: {e}")
 
 
+# Fast JSON parsing for the profile snapshot (optional)
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# Compact binary snapshot format (optional, falls back to JSON)
+try:
+    import msgpack
+    HAS_MSGPACK = True
+except ImportError:
+    HAS_MSGPACK = False
+
+# Stored PastConsultation fields, fetched in one C-level attrgetter call
+_CONSULT_KEYS = (
+    "session_id", "date", "symptoms", "urgency_level", "ai_response_summary",
+    "conditions_suggested", "medications_suggested", "follow_up_needed"
+)
+_CONSULT_GET = operator.attrgetter(*_CONSULT_KEYS)
+
+# Pre-resolved enum lookups (value -> member), cheaper than Enum.__call__
+_GENDER = Gender._value2member_map_
+_BLOOD = BloodType._value2member_map_
+
+
+def _to_enum(members: Dict, enum_cls, value):
+    """Enum member for value via its pre-resolved map; unknown values raise ValueError"""
+    member = members.get(value)
+    return member if member is not None else enum_cls(value)
+
+# Every byte except ASCII 0-9, stripped from phone numbers via bytes.translate
+_NON_DIGIT_BYTES = bytes(b for b in range(256) if not 48 <= b <= 57)
+
+# Compact the append log into a new snapshot once it outgrows the snapshot
+# by this factor (and is at least LOG_COMPACT_MIN_BYTES long)
+LOG_COMPACT_RATIO = 2
+LOG_COMPACT_MIN_BYTES = 64 * 1024
+
+# Max number of cached AI context strings
+AI_CONTEXT_CACHE_SIZE = 1024
+
+# In-process cache for PostgreSQL profile rows (entries, seconds)
+PG_CACHE_SIZE = 10_000
+PG_CACHE_TTL = 300
+
+
+def _has_data(path: Path) -> bool:
+    """True if path is an existing, non-empty file"""
+    return path.exists() and path.stat().st_size > 0
+
+
+def _read_mapped(path: Path) -> bytes:
+    """Read a whole file through a read-only mmap"""
+    with open(path, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            return buf[:]
+
+
+def _dumps(obj: Any) -> bytes:
+    """Serialize one log record"""
+    return orjson.dumps(obj) if HAS_ORJSON else json.dumps(obj, default=str).encode()
+
+
+def _loads(raw: bytes) -> Any:
+    """Parse one log record"""
+    return orjson.loads(raw) if HAS_ORJSON else json.loads(raw)
+
+
+def _consultation_to_dict(consultation: PastConsultation) -> Dict:
+    """Serialize a PastConsultation for storage"""
+    data = dict(zip(_CONSULT_KEYS, _CONSULT_GET(consultation)))
+    data["date"] = data["date"].isoformat()
+    return data
+
+
+def _remap_postgres_profile(data: Dict) -> Dict:
+    """
+    Remap a PostgreSQL profile row to UserProfile field names so it can be
+    validated in one model_validate call
+    """
+    return {
+        "phone_number": data.get("phone_number", ""),
+        "user_id": str(data.get("id", "")),
+        "name": data.get("name"),
+        "age": data.get("age"),
+        "gender": _GENDER.get(data.get("gender")),
+        "blood_type": _BLOOD.get(data.get("blood_type"), BloodType.UNKNOWN),
+        "height_cm": data.get("height_cm"),
+        "weight_kg": data.get("weight_kg"),
+        "preferred_language": data.get("preferred_language", "en"),
+        "total_consultations": data.get("total_consultations", 0),
+        "allergies": [
+            {
+                "allergen": a.get("allergen", ""),
+                "severity": a.get("severity", "moderate"),
+                "reaction": a.get("reaction"),
+            }
+            for a in data.get("allergies", [])
+        ],
+        "medical_conditions": [
+            {
+                "name": c.get("condition_name", ""),
+                "severity": c.get("severity"),
+                "is_active": c.get("is_active", True),
+            }
+            for c in data.get("medical_conditions", [])
+        ],
+        "current_medications": [
+            {
+                "name": m.get("medication_name", ""),
+                "dosage": m.get("dosage"),
+                "frequency": m.get("frequency"),
+            }
+            for m in data.get("current_medications", [])
+        ],
+    }
+
+
 class ProfileService:
     """
     User Profile Management Service
@@ -59,11 +186,18 @@ class ProfileService:
         Initialize profile service
         
         Args:
-            storage_path: Path to store profiles (for fallback JSON storage)
+            storage_path: Path to store profiles (for fallback JSON storage).
+                With msgpack installed the snapshot is written next to it
+                with a .msgpack suffix; the JSON file is read as a legacy
+                snapshot on first boot.
         """
         self.use_postgres = POSTGRES_AVAILABLE
         # In-memory cache for active profiles
         self._profiles: Dict[str, UserProfile] = {}
+        # AI context strings keyed by phone -> (updated_at_us, context), LRU-bounded
+        self._ai_context_cache: "OrderedDict[str, Tuple[int, str]]" = OrderedDict()
+        # PostgreSQL profile dicts keyed by phone -> (expires_at, profile_dict)
+        self._pg_cache: "OrderedDict[str, Tuple[float, Dict]]" = OrderedDict()
         
         # Persistent storage path
         if storage_path:
@@ -71,6 +205,18 @@ class ProfileService:
         else:
             # Default to data directory
             self._storage_path = Path(__file__).parent.parent.parent / "data" / "user_profiles.json"
+        self._snapshot_path = self._storage_path.with_suffix(".msgpack") if HAS_MSGPACK else self._storage_path
+        # Append-only log of per-profile changes since the last snapshot
+        self._log_path = self._storage_path.with_suffix(".log")
+        # Log moved aside by a compaction until its snapshot is written
+        self._old_log_path = self._log_path.with_suffix(".log.old")
+        self._log_file = None
+        # Serialized form of every stored profile as of the last log entry;
+        # compaction snapshots this rather than walking live profiles
+        self._persisted: Dict[str, Dict] = {}
+        self._log_size = 0
+        self._persist_lock = threading.Lock()
+        self._compacting = False
         
         # Load existing profiles
         self._load_profiles()
@@ -80,37 +226,159 @@ class ProfileService:
     def _load_profiles(self):
         """Load profiles from persistent storage"""
         try:
-            if self._storage_path.exists():
-                with open(self._storage_path, 'r') as f:
-                    data = json.load(f)
-                    for phone, profile_data in data.items():
-                        try:
-                            # Convert stored data back to UserProfile
-                            profile = self._dict_to_profile(profile_data)
-                            self._profiles[phone] = profile
-                        except Exception as e:
-                            logger.warning(f"Failed to load profile {phone}: {e}")
+            data = self._read_snapshot()
+            data = self._replay_log(data)
+            if data:
+                for phone, profile_data in data.items():
+                    profile = self._try_dict_to_profile(phone, profile_data)
+                    if profile is not None:
+                        self._profiles[phone] = profile
+                        self._persisted[phone] = profile_data
                 logger.info(f"Loaded {len(self._profiles)} profiles from storage")
         except Exception as e:
             logger.warning(f"Could not load profiles: {e}")
     
-    def _save_profiles(self):
-        """Save profiles to persistent storage"""
+    def _read_snapshot(self) -> Optional[Dict]:
+        """Read the msgpack snapshot, or the legacy JSON file if that's all there is"""
+        if HAS_MSGPACK and _has_data(self._snapshot_path):
+            return msgpack.unpackb(_read_mapped(self._snapshot_path), raw=False)
+        if _has_data(self._storage_path):
+            return _loads(_read_mapped(self._storage_path))
+        return None
+    
+    def _replay_log(self, data: Optional[Dict]) -> Optional[Dict]:
+        """Apply logged changes on top of the snapshot data"""
+        # A log left over from an unfinished compaction predates the current one
+        log_paths = [path for path in (self._old_log_path, self._log_path) if _has_data(path)]
+        if not log_paths:
+            return data
+        data = data if data is not None else {}
+        for log_path in log_paths:
+            with open(log_path, 'rb') as f:
+                for line in f:
+                    try:
+                        entry = _loads(line)
+                    except ValueError:
+                        # Torn final write from a crash - everything before it is intact
+                        logger.warning("Skipping malformed profile log entry")
+                        continue
+                    if entry["op"] == "set":
+                        data[entry["phone"]] = entry["profile"]
+                    elif entry["op"] == "delete":
+                        data.pop(entry["phone"], None)
+        self._log_size = sum(path.stat().st_size for path in log_paths)
+        return data
+    
+    def _try_dict_to_profile(self, phone: str, profile_data: Dict) -> Optional[UserProfile]:
+        """Convert one stored profile, logging instead of raising"""
+        try:
+            return self._dict_to_profile(profile_data)
+        except Exception as e:
+            logger.warning(f"Failed to load profile {phone}: {e}")
+            return None
+    
+    def _write_snapshot(self, data: Dict) -> bool:
+        """Save a full snapshot of serialized profiles; returns False on failure"""
         try:
             # Ensure directory exists
             self._storage_path.parent.mkdir(parents=True, exist_ok=True)
             
-            # Convert profiles to serializable format
-            data = {}
-            for phone, profile in self._profiles.items():
-                data[phone] = self._profile_to_dict(profile)
+            if HAS_MSGPACK:
+                payload = msgpack.packb(data, use_bin_type=True)
+            else:
+                payload = json.dumps(data, default=str).encode()
             
-            with open(self._storage_path, 'w') as f:
-                json.dump(data, f, indent=2, default=str)
+            # Write then rename so a crash never leaves a half-written snapshot
+            tmp_path = self._snapshot_path.with_suffix(".tmp")
+            tmp_path.write_bytes(payload)
+            os.replace(tmp_path, self._snapshot_path)
             
-            logger.debug(f"Saved {len(self._profiles)} profiles to storage")
+            logger.debug(f"Saved {len(data)} profiles to storage")
+            return True
         except Exception as e:
             logger.error(f"Failed to save profiles: {e}")
+            return False
+    
+    def _append_log(self, entry: Dict):
+        """Durably append one change record to the profile log"""
+        try:
+            with self._persist_lock:
+                if self._log_file is None:
+                    self._log_path.parent.mkdir(parents=True, exist_ok=True)
+                    self._log_file = open(self._log_path, 'ab')
+                record = _dumps(entry) + b"\n"
+                self._log_file.write(record)
+                self._log_file.flush()
+                os.fsync(self._log_file.fileno())
+                self._log_size += len(record)
+                if entry["op"] == "set":
+                    self._persisted[entry["phone"]] = entry["profile"]
+                else:
+                    self._persisted.pop(entry["phone"], None)
+                self._maybe_compact()
+        except Exception as e:
+            logger.error(f"Failed to append profile log: {e}")
+    
+    def _log_profile(self, profile: UserProfile):
+        """Persist a single changed profile"""
+        phone = profile.phone_number
+        # PostgreSQL-backed profiles are not part of the local store
+        if self._profiles.get(phone) is not profile:
+            return
+        self._append_log({"op": "set", "phone": phone, "profile": self._profile_to_dict(profile)})
+    
+    def _log_delete(self, phone: str):
+        """Persist a profile deletion"""
+        self._append_log({"op": "delete", "phone": phone})
+    
+    def _maybe_compact(self):
+        """
+        Start a background snapshot once the log outgrows the snapshot
+        (caller holds _persist_lock, so only one compaction runs at a time)
+        """
+        snapshot_size = self._snapshot_path.stat().st_size if self._snapshot_path.exists() else 0
+        threshold = max(LOG_COMPACT_RATIO * snapshot_size, LOG_COMPACT_MIN_BYTES)
+        if self._compacting or self._log_size <= threshold:
+            return
+        self._compacting = True
+        threading.Thread(target=self._compact, name="profile-log-compaction", daemon=True).start()
+    
+    def _compact(self):
+        """Write a fresh snapshot and drop the log entries it covers"""
+        try:
+            # Only the copy and the log switch hold the lock, so appends
+            # carry on while the snapshot is serialized and written
+            with self._persist_lock:
+                data = dict(self._persisted)
+                self._rotate_log()
+            # Keep the rotated log if the snapshot could not be written;
+            # it is replayed on load and folded into the next compaction
+            if not self._write_snapshot(data):
+                return
+            self._old_log_path.unlink(missing_ok=True)
+            logger.info("Compacted profile log into snapshot")
+        except Exception as e:
+            logger.error(f"Profile log compaction failed: {e}")
+        finally:
+            with self._persist_lock:
+                self._compacting = False
+    
+    def _rotate_log(self):
+        """Move the log aside for compaction; appends start a new one (caller holds _persist_lock)"""
+        if self._log_file is not None:
+            self._log_file.close()
+            self._log_file = None
+        if _has_data(self._log_path):
+            if self._old_log_path.exists():
+                # An earlier compaction failed - keep its entries first
+                with open(self._old_log_path, 'ab') as old_log, open(self._log_path, 'rb') as log:
+                    shutil.copyfileobj(log, old_log)
+                    old_log.flush()
+                    os.fsync(old_log.fileno())
+                os.remove(self._log_path)
+            else:
+                os.replace(self._log_path, self._old_log_path)
+        self._log_size = 0
     
     def _profile_to_dict(self, profile: UserProfile) -> Dict:
         """Convert UserProfile to serializable dict"""
@@ -128,92 +396,72 @@ class ProfileService:
             "medical_conditions": [c.model_dump() for c in profile.medical_conditions],
             "allergies": [a.model_dump() for a in profile.allergies],
             "current_medications": [m.model_dump() for m in profile.current_medications],
-            "family_history": profile.family_history,
+            # Containers are copied so stored dicts never share state with the live profile
+            "family_history": list(profile.family_history),
             "smoking": profile.smoking,
             "alcohol": profile.alcohol,
             "exercise_frequency": profile.exercise_frequency,
-            "recurring_symptoms": profile.recurring_symptoms,
-            "symptom_frequency": profile.symptom_frequency,
+            "recurring_symptoms": list(profile.recurring_symptoms),
+            "symptom_frequency": dict(profile.symptom_frequency),
             "emergency_contact": profile.emergency_contact.model_dump() if profile.emergency_contact else None,
             "created_at": profile.created_at.isoformat(),
-            "updated_at": profile.updated_at.isoformat(),
+            "updated_at_us": profile.updated_at_us,
             "last_consultation": profile.last_consultation.isoformat() if profile.last_consultation else None,
             "total_consultations": profile.total_consultations,
             "consultation_history": [
-                {
-                    "session_id": c.session_id,
-                    "date": c.date.isoformat(),
-                    "symptoms": c.symptoms,
-                    "urgency_level": c.urgency_level,
-                    "ai_response_summary": c.ai_response_summary,
-                    "conditions_suggested": c.conditions_suggested,
-                    "medications_suggested": c.medications_suggested,
-                    "follow_up_needed": c.follow_up_needed
-                }
-                for c in profile.consultation_history[-20:]  # Keep last 20
+                _consultation_to_dict(c)
+                for c in profile.consultation_history  # Already bounded to the last 20
             ]
         }
     
     def _dict_to_profile(self, data: Dict) -> UserProfile:
         """Convert dict back to UserProfile"""
-        profile = UserProfile(
-            phone_number=data["phone_number"],
-            user_id=data.get("user_id", ""),
-            name=data.get("name"),
-            age=data.get("age"),
-            gender=Gender(data["gender"]) if data.get("gender") else None,
-            blood_type=BloodType(data["blood_type"]) if data.get("blood_type") else BloodType.UNKNOWN,
-            height_cm=data.get("height_cm"),
-            weight_kg=data.get("weight_kg"),
-            preferred_language=data.get("preferred_language", "en"),
-            location=data.get("location"),
-            family_history=data.get("family_history", []),
-            smoking=data.get("smoking"),
-            alcohol=data.get("alcohol"),
-            exercise_frequency=data.get("exercise_frequency"),
-            recurring_symptoms=data.get("recurring_symptoms", []),
-            symptom_frequency=data.get("symptom_frequency", {}),
-            total_consultations=data.get("total_consultations", 0)
+        # Persisted keys already match UserProfile field names, so the whole
+        # profile (nested lists included) is validated in a single call
+        if not data.get("blood_type"):
+            data = {**data, "blood_type": BloodType.UNKNOWN}
+        return UserProfile.model_validate(data)
+    
+    # ==========================================
+    # PostgreSQL read-through / write-through cache
+    # ==========================================
+    
+    def _pg_cache_get(self, phone_number: str) -> Optional[Dict]:
+        """Return the cached PostgreSQL profile dict if present and fresh"""
+        entry = self._pg_cache.get(phone_number)
+        if entry is None:
+            return None
+        if entry[0] < time.monotonic():
+            del self._pg_cache[phone_number]
+            return None
+        self._pg_cache.move_to_end(phone_number)
+        return entry[1]
+    
+    def _pg_cache_put(self, phone_number: str, profile_dict: Dict):
+        """Store a PostgreSQL profile dict, evicting the least recently used"""
+        self._pg_cache[phone_number] = (time.monotonic() + PG_CACHE_TTL, profile_dict)
+        self._pg_cache.move_to_end(phone_number)
+        if len(self._pg_cache) > PG_CACHE_SIZE:
+            self._pg_cache.popitem(last=False)
+    
+    def _pg_cache_invalidate(self, phone_number: str):
+        """Drop a cached PostgreSQL profile after a write to its child tables"""
+        self._pg_cache.pop(phone_number, None)
+    
+    def _pg_get_or_create(self, phone_number: str, **kwargs) -> Tuple[Dict, bool]:
+        """get_or_create against PostgreSQL, served from cache when possible"""
+        cached = self._pg_cache_get(phone_number)
+        if cached is not None:
+            return cached, False
+        profile_dict, is_new = postgres_profile_service.get_or_create_profile(
+            phone_number=phone_number,
+            name=kwargs.get('name'),
+            age=kwargs.get('age'),
+            gender=kwargs.get('gender'),
+            preferred_language=kwargs.get('preferred_language') or 'en'
         )
-        
-        # Parse dates
-        if data.get("created_at"):
-            profile.created_at = datetime.fromisoformat(data["created_at"])
-        if data.get("updated_at"):
-            profile.updated_at = datetime.fromisoformat(data["updated_at"])
-        if data.get("last_consultation"):
-            profile.last_consultation = datetime.fromisoformat(data["last_consultation"])
-        
-        # Parse medical conditions
-        for c in data.get("medical_conditions", []):
-            profile.medical_conditions.append(MedicalCondition(**c))
-        
-        # Parse allergies
-        for a in data.get("allergies", []):
-            profile.allergies.append(Allergy(**a))
-        
-        # Parse medications
-        for m in data.get("current_medications", []):
-            profile.current_medications.append(CurrentMedication(**m))
-        
-        # Parse emergency contact
-        if data.get("emergency_contact"):
-            profile.emergency_contact = EmergencyContact(**data["emergency_contact"])
-        
-        # Parse consultation history
-        for c in data.get("consultation_history", []):
-            profile.consultation_history.append(PastConsultation(
-                session_id=c["session_id"],
-                date=datetime.fromisoformat(c["date"]),
-                symptoms=c["symptoms"],
-                urgency_level=c["urgency_level"],
-                ai_response_summary=c.get("ai_response_summary"),
-                conditions_suggested=c.get("conditions_suggested", []),
-                medications_suggested=c.get("medications_suggested", []),
-                follow_up_needed=c.get("follow_up_needed", False)
-            ))
-        
-        return profile
+        self._pg_cache_put(phone_number, profile_dict)
+        return profile_dict, is_new
     
     def _generate_user_id(self, phone: str) -> str:
         """Generate a unique user ID from phone number"""
@@ -226,13 +474,16 @@ class ProfileService:
     def phone_exists(self, phone_number: str) -> bool:
         """Check if a phone number has an existing profile"""
         if self.use_postgres:
+            if self._pg_cache_get(phone_number) is not None:
+                return True
             return postgres_profile_service.phone_exists(phone_number)
         normalized = self._normalize_phone(phone_number)
         return normalized in self._profiles
     
     def _normalize_phone(self, phone: str) -> str:
         """Normalize phone number (remove spaces, dashes, etc.)"""
-        return ''.join(filter(str.isdigit, phone))[-10:]  # Last 10 digits
+        digits = phone.encode('ascii', 'ignore').translate(None, _NON_DIGIT_BYTES)
+        return digits[-10:].decode('ascii')  # Last 10 digits
     
     def create_profile(self, phone_number: str, name: str = None, 
                       age: int = None, gender: str = None,
@@ -251,8 +502,8 @@ class ProfileService:
             Created UserProfile
         """
         if self.use_postgres:
-            profile_dict, is_new = postgres_profile_service.get_or_create_profile(
-                phone_number=phone_number,
+            profile_dict, is_new = self._pg_get_or_create(
+                phone_number,
                 name=name,
                 age=age,
                 gender=gender,
@@ -269,20 +520,21 @@ class ProfileService:
             return self._profiles[normalized_phone]
         
         # Create new profile
+        now_us = utc_now_us()
         profile = UserProfile(
             phone_number=normalized_phone,
             user_id=self._generate_user_id(normalized_phone),
             name=name,
             age=age,
-            gender=Gender(gender) if gender else None,
+            gender=_to_enum(_GENDER, Gender, gender) if gender else None,
             preferred_language=preferred_language,
-            created_at=datetime.utcnow(),
-            updated_at=datetime.utcnow()
+            created_at=epoch_us_to_datetime(now_us),
+            updated_at_us=now_us
         )
         
         # Store and persist
         self._profiles[normalized_phone] = profile
-        self._save_profiles()
+        self._log_profile(profile)
         
         logger.info(f"✅ Created new profile for {normalized_phone}")
         return profile
@@ -298,65 +550,19 @@ class ProfileService:
             UserProfile if found, None otherwise
         """
         if self.use_postgres:
-            profile_dict = postgres_profile_service.get_profile(phone_number)
-            if profile_dict:
-                return self._dict_to_profile_from_postgres(profile_dict)
-            return None
+            profile_dict = self._pg_cache_get(phone_number)
+            if profile_dict is None:
+                profile_dict = postgres_profile_service.get_profile(phone_number)
+                if not profile_dict:
+                    return None
+                self._pg_cache_put(phone_number, profile_dict)
+            return self._dict_to_profile_from_postgres(profile_dict)
         normalized = self._normalize_phone(phone_number)
         return self._profiles.get(normalized)
     
     def _dict_to_profile_from_postgres(self, data: Dict) -> UserProfile:
         """Convert PostgreSQL dict to UserProfile"""
-        profile = UserProfile(
-            phone_number=data.get("phone_number", ""),
-            user_id=str(data.get("id", "")),
-            name=data.get("name"),
-            age=data.get("age"),
-            height_cm=data.get("height_cm"),
-            weight_kg=data.get("weight_kg"),
-            preferred_language=data.get("preferred_language", "en"),
-            total_consultations=data.get("total_consultations", 0)
-        )
-        
-        # Handle gender
-        if data.get("gender"):
-            try:
-                profile.gender = Gender(data["gender"])
-            except:
-                pass
-        
-        # Handle blood type
-        if data.get("blood_type"):
-            try:
-                profile.blood_type = BloodType(data["blood_type"])
-            except:
-                pass
-        
-        # Handle allergies
-        for a in data.get("allergies", []):
-            profile.allergies.append(Allergy(
-                allergen=a.get("allergen", ""),
-                severity=a.get("severity", "moderate"),
-                reaction=a.get("reaction")
-            ))
-        
-        # Handle conditions
-        for c in data.get("medical_conditions", []):
-            profile.medical_conditions.append(MedicalCondition(
-                name=c.get("condition_name", ""),
-                severity=c.get("severity"),
-                is_active=c.get("is_active", True)
-            ))
-        
-        # Handle medications
-        for m in data.get("current_medications", []):
-            profile.current_medications.append(CurrentMedication(
-                name=m.get("medication_name", ""),
-                dosage=m.get("dosage"),
-                frequency=m.get("frequency")
-            ))
-        
-        return profile
+        return UserProfile.model_validate(_remap_postgres_profile(data))
     
     def get_or_create_profile(self, phone_number: str, **kwargs) -> Tuple[UserProfile, bool]:
         """
@@ -366,13 +572,7 @@ class ProfileService:
             (profile, is_new) - The profile and whether it was newly created
         """
         if self.use_postgres:
-            profile_dict, is_new = postgres_profile_service.get_or_create_profile(
-                phone_number=phone_number,
-                name=kwargs.get('name'),
-                age=kwargs.get('age'),
-                gender=kwargs.get('gender'),
-                preferred_language=kwargs.get('preferred_language', 'en')
-            )
+            profile_dict, is_new = self._pg_get_or_create(phone_number, **kwargs)
             return self._dict_to_profile_from_postgres(profile_dict), is_new
         
         normalized = self._normalize_phone(phone_number)
@@ -400,6 +600,8 @@ class ProfileService:
         if self.use_postgres:
             result = postgres_profile_service.update_profile(phone_number, **updates)
             if result:
+                # Write-through: the updated row is the freshest copy
+                self._pg_cache_put(phone_number, result)
                 logger.info(f"Updated profile in PostgreSQL for {phone_number}")
                 return self._dict_to_profile_from_postgres(result)
             return None
@@ -411,6 +613,11 @@ class ProfileService:
         
         logger.info(f"Profile found: {profile.name}, height_cm before update: {profile.height_cm}")
         
+        # Resolve enum fields up front so an unknown value is rejected
+        # before any field of the profile changes
+        gender = _to_enum(_GENDER, Gender, updates['gender']) if updates.get('gender') else None
+        blood_type = _to_enum(_BLOOD, BloodType, updates['blood_type']) if updates.get('blood_type') else None
+        
         # Update allowed fields
         allowed_fields = [
             'name', 'age', 'height_cm', 'weight_kg', 'location',
@@ -426,13 +633,13 @@ class ProfileService:
         logger.info(f"Profile height_cm after setattr: {profile.height_cm}")
         
         # Handle gender and blood_type specially
-        if 'gender' in updates and updates['gender']:
-            profile.gender = Gender(updates['gender'])
-        if 'blood_type' in updates and updates['blood_type']:
-            profile.blood_type = BloodType(updates['blood_type'])
+        if gender is not None:
+            profile.gender = gender
+        if blood_type is not None:
+            profile.blood_type = blood_type
         
-        profile.updated_at = datetime.utcnow()
-        self._save_profiles()
+        profile.updated_at_us = utc_now_us()
+        self._log_profile(profile)
         
         logger.info(f"Updated profile for {phone_number}, final height_cm: {profile.height_cm}")
         return profile
@@ -442,6 +649,7 @@ class ProfileService:
         """Add an allergy to user profile"""
         if self.use_postgres:
             success = postgres_profile_service.add_allergy(phone_number, allergen, severity, reaction)
+            self._pg_cache_invalidate(phone_number)
             if success:
                 return self.get_profile(phone_number)
             return None
@@ -451,17 +659,20 @@ class ProfileService:
             return None
         
         # Check if already exists
-        for a in profile.allergies:
-            if a.allergen.lower() == allergen.lower():
-                return profile  # Already has this allergy
+        key = allergen.lower()
+        if key in profile._allergen_index:
+            return profile  # Already has this allergy
         
-        profile.allergies.append(Allergy(
+        # Build first: a validation error must not leave a stale index entry
+        allergy = Allergy(
             allergen=allergen,
             severity=severity,
             reaction=reaction
-        ))
-        profile.updated_at = datetime.utcnow()
-        self._save_profiles()
+        )
+        profile._allergen_index[key] = len(profile.allergies)
+        profile.allergies.append(allergy)
+        profile.updated_at_us = utc_now_us()
+        self._log_profile(profile)
         
         logger.info(f"Added allergy '{allergen}' for {phone_number}")
         return profile
@@ -472,6 +683,7 @@ class ProfileService:
         """Add a medical condition to user profile"""
         if self.use_postgres:
             success = postgres_profile_service.add_condition(phone_number, name, severity, notes)
+            self._pg_cache_invalidate(phone_number)
             if success:
                 return self.get_profile(phone_number)
             return None
@@ -481,19 +693,22 @@ class ProfileService:
             return None
         
         # Check if already exists
-        for c in profile.medical_conditions:
-            if c.name.lower() == name.lower():
-                return profile  # Already has this condition
+        key = name.lower()
+        if key in profile._condition_index:
+            return profile  # Already has this condition
         
-        profile.medical_conditions.append(MedicalCondition(
+        # Build first: a validation error must not leave a stale index entry
+        condition = MedicalCondition(
             name=name,
             diagnosed_date=diagnosed_date,
             severity=severity,
             notes=notes,
             is_active=True
-        ))
-        profile.updated_at = datetime.utcnow()
-        self._save_profiles()
+        )
+        profile._condition_index[key] = len(profile.medical_conditions)
+        profile.medical_conditions.append(condition)
+        profile.updated_at_us = utc_now_us()
+        self._log_profile(profile)
         
         logger.info(f"Added condition '{name}' for {phone_number}")
         return profile
@@ -507,19 +722,23 @@ class ProfileService:
             return None
         
         # Check if already exists
-        for m in profile.current_medications:
-            if m.name.lower() == name.lower():
-                return profile  # Already has this medication
+        key = name.lower()
+        if key in profile._medication_index:
+            return profile  # Already has this medication
         
-        profile.current_medications.append(CurrentMedication(
+        # Build first: a validation error must not leave a stale index entry
+        now_us = utc_now_us()
+        medication = CurrentMedication(
             name=name,
             dosage=dosage,
             frequency=frequency,
             prescribed_for=prescribed_for,
-            start_date=datetime.utcnow().strftime("%Y-%m-%d")
-        ))
-        profile.updated_at = datetime.utcnow()
-        self._save_profiles()
+            start_date=epoch_us_to_datetime(now_us).strftime("%Y-%m-%d")
+        )
+        profile._medication_index[key] = len(profile.current_medications)
+        profile.current_medications.append(medication)
+        profile.updated_at_us = now_us
+        self._log_profile(profile)
         
         logger.info(f"Added medication '{name}' for {phone_number}")
         return profile
@@ -536,8 +755,8 @@ class ProfileService:
             relationship=relationship,
             phone=contact_phone
         )
-        profile.updated_at = datetime.utcnow()
-        self._save_profiles()
+        profile.updated_at_us = utc_now_us()
+        self._log_profile(profile)
         
         logger.info(f"Set emergency contact for {phone_number}")
         return profile
@@ -560,6 +779,7 @@ class ProfileService:
                     medications_suggested=medications,
                     summary=summary
                 )
+                self._pg_cache_invalidate(phone_number)
                 logger.info(f"📝 PostgreSQL: Recorded consultation for {phone_number}")
             except Exception as e:
                 logger.error(f"PostgreSQL consultation record failed: {e}")
@@ -578,7 +798,7 @@ class ProfileService:
             medications=medications,
             summary=summary
         )
-        self._save_profiles()
+        self._log_profile(profile)
         
         logger.info(f"Recorded consultation for {phone_number}: {symptoms}")
         return profile
@@ -592,7 +812,23 @@ class ProfileService:
         if not profile:
             return "New user - no medical history on file."
         
-        return profile.get_ai_context()
+        # PostgreSQL rows don't bump updated_at on allergy/condition changes,
+        # so only the in-memory profiles can be cached safely
+        if self.use_postgres:
+            return profile.get_ai_context()
+        
+        key = profile.phone_number
+        cached = self._ai_context_cache.get(key)
+        if cached and cached[0] == profile.updated_at_us:
+            self._ai_context_cache.move_to_end(key)
+            return cached[1]
+        
+        context = profile.get_ai_context()
+        self._ai_context_cache[key] = (profile.updated_at_us, context)
+        self._ai_context_cache.move_to_end(key)
+        if len(self._ai_context_cache) > AI_CONTEXT_CACHE_SIZE:
+            self._ai_context_cache.popitem(last=False)
+        return context
     
     def get_consultation_history(self, phone_number: str, limit: int = 10) -> List[Dict]:
         """Get recent consultation history for a user"""
@@ -609,7 +845,7 @@ class ProfileService:
             return []
         
         history = []
-        for c in profile.consultation_history[-limit:]:
+        for c in profile.recent_consultations(limit):
             history.append({
                 "session_id": c.session_id,
                 "date": c.date.isoformat(),
@@ -634,7 +870,9 @@ class ProfileService:
         normalized = self._normalize_phone(phone_number)
         if normalized in self._profiles:
             del self._profiles[normalized]
-            self._save_profiles()
+            self._ai_context_cache.pop(normalized, None)
+            self._pg_cache_invalidate(phone_number)
+            self._log_delete(normalized)
             logger.info(f"Deleted profile for {normalized}")
             return True
         return False
@@ -9,13 +9,28 @@ Features:
 - 14+ Indian languages supported
 """
 
+import aiofiles
+import aiohttp
 import edge_tts
 import asyncio
+import hashlib
+import json
 import logging
 import os
+import queue
+import re
+import stat
 import tempfile
-from typing import Optional, Dict, List, Literal
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from pathlib import Path
+from typing import AsyncIterator, Optional, Dict, List, Literal
 from enum import Enum
+from functools import lru_cache
+
+from app.config import settings
 
 logger = logging.getLogger(__name__)
 
@@ -32,6 +47,11 @@ class SpeechSpeed(str, Enum):
     VERY_SLOW = "very_slow"  # -35% speed (for elderly)
 
 
+# Request string -> enum lookups (cheaper than Enum construction + try/except)
+_GENDER_MAP = {g.value: g for g in VoiceGender}
+_SPEED_MAP = {s.value: s for s in SpeechSpeed}
+
+
 # Speed adjustments for different modes
 # These are ABSOLUTE rates (not stacked on language base rate)
 SPEED_ADJUSTMENTS = {
@@ -155,6 +175,356 @@ NEURAL_VOICES = {
 }
 
 
+# _clean_text_cached: one str.translate pass drops markdown asterisks and emoji /
+# misc symbols, then newlines and whitespace are normalized
+_CLEAN_TABLE = {ord("*"): None}
+_CLEAN_TABLE.update(dict.fromkeys(range(0x1F300, 0x1FA00)))
+_CLEAN_TABLE.update(dict.fromkeys(range(0x2600, 0x2700)))
+_PARAGRAPH_RE = re.compile(r'\n{2,}')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# Sentence boundaries (Latin punctuation and the Devanagari danda)
+_SENTENCE_SPLIT_RE = re.compile(r'(?<=[.!?\u0964])\s+')
+
+
+@lru_cache(maxsize=512)
+def _clean_text_cached(text: str) -> str:
+    """Clean text for TTS - remove markdown and emojis. Memoized: bot
+    prompts and canned replies repeat verbatim."""
+    clean = text.translate(_CLEAN_TABLE)
+    clean = _PARAGRAPH_RE.sub('. ', clean)
+    clean = clean.replace('\n', ', ')
+    return _WHITESPACE_RE.sub(' ', clean).strip()
+
+
+# Max Edge TTS syntheses in flight per process. More parallel requests on
+# one box mostly slow each other down (shared sockets, endpoint throttling),
+# so queueing the excess keeps p50/p99 latency stable under load.
+TTS_CONCURRENCY = int(os.getenv("TTS_CONCURRENCY", "4"))
+
+# Shared event loop for the sync wrappers, run on a daemon thread
+_bg_loop: Optional[asyncio.AbstractEventLoop] = None
+_bg_loop_lock = threading.Lock()
+
+
+def _background_loop() -> asyncio.AbstractEventLoop:
+    """Return the persistent background event loop, starting it on first use."""
+    global _bg_loop
+    if _bg_loop is None:
+        with _bg_loop_lock:
+            if _bg_loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=_run_background_loop, args=(loop,), name="tts-event-loop", daemon=True).start()
+                _bg_loop = loop
+    return _bg_loop
+
+
+def _run_background_loop(loop: asyncio.AbstractEventLoop):
+    """Thread body for the background loop; once stopped, cancels what's left and closes it."""
+    asyncio.set_event_loop(loop)
+    try:
+        loop.run_forever()
+    finally:
+        pending = asyncio.all_tasks(loop)
+        for task in pending:
+            task.cancel()
+        loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+        loop.run_until_complete(loop.shutdown_asyncgens())
+        loop.close()
+
+
+# Upper bound for the blocking sync wrappers
+TTS_SYNC_TIMEOUT = 30
+
+
+def _run_sync(coro):
+    """
+    Run a coroutine on the background loop and block for its result.
+    Refuses to block a running event loop - async callers must await the
+    *_async variant instead of stalling every other request on that loop.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        pass
+    else:
+        coro.close()
+        raise RuntimeError("TTS sync API called from a running event loop; await the *_async variant instead")
+    return asyncio.run_coroutine_threadsafe(coro, _background_loop()).result(timeout=TTS_SYNC_TIMEOUT)
+
+
+# Pool of reusable accumulation buffers for streamed audio
+_BUFFER_SIZE = 256 * 1024
+_BUFFER_MAX_POOLED = 1024 * 1024  # Don't keep buffers that grew past this
+_BUFFER_POOL: "queue.LifoQueue[bytearray]" = queue.LifoQueue(maxsize=32)
+
+
+class _AudioBuffer:
+    """
+    Accumulates MP3 chunks in a pooled, pre-sized bytearray.
+    
+    Chunks are copied into existing capacity instead of growing a fresh
+    bytearray per request; release() hands the buffer back to the pool.
+    """
+    
+    def __init__(self):
+        try:
+            self._buf = _BUFFER_POOL.get_nowait()
+        except queue.Empty:
+            self._buf = bytearray(_BUFFER_SIZE)
+        self._len = 0
+    
+    def __len__(self) -> int:
+        return self._len
+    
+    def append(self, data: bytes):
+        end = self._len + len(data)
+        # Slice assignment copies in place, growing only past capacity
+        self._buf[self._len:end] = data
+        self._len = end
+    
+    def getvalue(self) -> bytes:
+        with memoryview(self._buf) as view, view[:self._len] as part:
+            return bytes(part)
+    
+    def release(self):
+        if len(self._buf) <= _BUFFER_MAX_POOLED:
+            try:
+                _BUFFER_POOL.put_nowait(self._buf)
+            except queue.Full:
+                pass
+        self._buf = None
+
+
+def _write_atomic(path: Path, data: bytes):
+    """
+    Publish a file so readers never see it half-written: the data goes to a
+    unique temp file (mode 0600) in the same directory, which is renamed
+    over the destination, so readers see either the old file or the new one.
+    A crash can leave the temp file behind; SynthesisCache's sweep removes it.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as tmp:
+            tmp.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+class _SharedConnector(aiohttp.TCPConnector):
+    """
+    TCPConnector shared by every Communicate instance on one event loop.
+    
+    edge_tts opens its own ClientSession per call, and a session closes its
+    connector on exit; ignoring that close keeps the DNS cache and socket
+    limits alive across requests. TTSService.shutdown() closes it for real
+    through close_shared().
+    """
+    
+    async def close(self, **kwargs):
+        pass
+    
+    async def close_shared(self):
+        """Close the pooled connections; must run on the connector's own loop."""
+        await super().close()
+
+
+class SynthesisCache:
+    """
+    LRU cache of synthesized MP3 audio keyed on (text, voice, rate, pitch).
+    
+    Entries live in memory (bounded by count and total bytes) and are also
+    written to disk with a JSON sidecar, so a restart keeps the cache warm.
+    The disk copy is swept periodically: expired entries go first, then the
+    oldest until it fits its own count and byte bounds.
+    
+    The cache directory (settings.TTS_CACHE_DIR by default) holds health
+    speech and is served back as-is, so it must be private to this user:
+    it is created 0700, and the disk cache is disabled if an existing one
+    is owned by someone else or open to other users.
+    """
+    
+    # Disk writes between sweeps of the cache directory
+    SWEEP_EVERY = 64
+    # Age after which a temp file, or a file missing its .mp3/.json partner,
+    # counts as abandoned
+    ORPHAN_GRACE_SECONDS = 60
+    
+    def __init__(
+        self,
+        max_entries: int = 256,
+        max_bytes: int = 64 * 1024 * 1024,
+        cache_dir: Optional[Path] = None,
+        ttl_seconds: int = 24 * 3600,
+        max_disk_entries: int = 2048,
+        max_disk_bytes: int = 256 * 1024 * 1024
+    ):
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._bytes = 0
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.max_disk_entries = max_disk_entries
+        self.max_disk_bytes = max_disk_bytes
+        # Starts at 0 so the first write also sweeps what earlier runs left behind
+        self._writes_since_sweep = 0
+        self._sweep_lock = threading.Lock()
+        self._dir = self._private_dir(cache_dir or Path(settings.TTS_CACHE_DIR))
+    
+    @staticmethod
+    def _private_dir(path: Path) -> Optional[Path]:
+        """Create the cache directory (0700) and check nobody else controls it; None disables the disk cache."""
+        try:
+            path.mkdir(mode=0o700, parents=True, exist_ok=True)
+            st = os.lstat(path)
+            if not stat.S_ISDIR(st.st_mode):
+                raise OSError(f"{path} is not a directory")
+            # POSIX only: Windows has no uids or meaningful mode bits
+            if hasattr(os, "getuid"):
+                if st.st_uid != os.getuid():
+                    raise OSError(f"{path} is owned by another user")
+                if st.st_mode & 0o077:
+                    raise OSError(f"{path} is accessible to other users (mode {stat.S_IMODE(st.st_mode):o})")
+        except OSError as e:
+            logger.warning(f"TTS disk cache disabled: {e}")
+            return None
+        return path
+    
+    @staticmethod
+    def make_key(text: str, voice: str, rate: str, pitch: str) -> str:
+        """Cache key for a synthesis request."""
+        return hashlib.sha256(f"{text}|{voice}|{rate}|{pitch}".encode()).hexdigest()
+    
+    async def get(self, key: str) -> Optional[bytes]:
+        """Return cached audio, checking memory first and then disk."""
+        data = self._entries.get(key)
+        if data is not None:
+            self._entries.move_to_end(key)
+            return data
+        
+        data = await self._read_disk(key)
+        if data is not None:
+            self._store(key, data)
+        return data
+    
+    def put(self, key: str, data: bytes):
+        """
+        Cache audio in memory and on disk. Must be called from the event loop;
+        the disk write runs in the default executor so callers don't wait on it.
+        """
+        self._store(key, data)
+        if self._dir is not None:
+            loop = asyncio.get_running_loop()
+            loop.run_in_executor(None, self._write_disk, key, data)
+            if self._writes_since_sweep % self.SWEEP_EVERY == 0:
+                loop.run_in_executor(None, self._sweep_disk)
+            self._writes_since_sweep += 1
+    
+    def _store(self, key: str, data: bytes):
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._bytes -= len(old)
+        self._entries[key] = data
+        self._bytes += len(data)
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= len(evicted)
+    
+    async def _read_disk(self, key: str) -> Optional[bytes]:
+        # aiofiles keeps the MP3 read-back off the event loop thread
+        if self._dir is None:
+            return None
+        audio_path = self._dir / f"{key}.mp3"
+        meta_path = self._dir / f"{key}.json"
+        try:
+            async with aiofiles.open(meta_path, "r") as f:
+                meta = json.loads(await f.read())
+            if time.time() - meta["createdAt"] > self.ttl_seconds:
+                await asyncio.to_thread(self._remove_files, audio_path, meta_path)
+                return None
+            async with aiofiles.open(audio_path, "rb") as f:
+                return await f.read()
+        except (OSError, ValueError, KeyError):
+            return None
+    
+    @staticmethod
+    def _remove_files(*paths: Path):
+        for path in paths:
+            path.unlink(missing_ok=True)
+    
+    def _write_disk(self, key: str, data: bytes):
+        if self._dir is None:
+            return
+        try:
+            # Audio first: readers only look for it once the sidecar exists
+            _write_atomic(self._dir / f"{key}.mp3", data)
+            _write_atomic(
+                self._dir / f"{key}.json",
+                json.dumps({"createdAt": time.time()}).encode()
+            )
+        except OSError as e:
+            logger.debug(f"TTS disk cache write failed: {e}")
+    
+    def _sweep_disk(self):
+        """Drop expired and abandoned files, then the oldest entries past the disk bounds."""
+        # A sweep still running from an earlier write covers this one
+        if self._dir is None or not self._sweep_lock.acquire(blocking=False):
+            return
+        try:
+            now = time.time()
+            pairs: Dict[str, Dict[str, os.DirEntry]] = {}
+            with os.scandir(self._dir) as it:
+                for entry in it:
+                    stem, _, ext = entry.name.rpartition(".")
+                    if ext in ("mp3", "json"):
+                        pairs.setdefault(stem, {})[ext] = entry
+                    elif ext == "tmp":
+                        # Left by a writer that died before its rename
+                        try:
+                            if now - entry.stat().st_mtime > self.ORPHAN_GRACE_SECONDS:
+                                self._remove_files(Path(entry.path))
+                        except OSError:
+                            pass
+            
+            live = []
+            total = 0
+            for files in pairs.values():
+                paths = [Path(entry.path) for entry in files.values()]
+                try:
+                    # The sidecar is written last, so its mtime is the entry's creation time
+                    stats = {ext: entry.stat() for ext, entry in files.items()}
+                except OSError:
+                    continue  # Removed by a concurrent read
+                if len(files) < 2:
+                    # Half-written entry; only abandoned once its writer is surely done
+                    if now - max(st.st_mtime for st in stats.values()) > self.ORPHAN_GRACE_SECONDS:
+                        self._remove_files(*paths)
+                    continue
+                created = stats["json"].st_mtime
+                if now - created > self.ttl_seconds:
+                    self._remove_files(*paths)
+                    continue
+                size = stats["mp3"].st_size
+                live.append((created, size, paths))
+                total += size
+            
+            # Oldest first until both bounds hold
+            live.sort(key=lambda item: item[0])
+            excess = len(live) - self.max_disk_entries
+            for _, size, paths in live:
+                if excess <= 0 and total <= self.max_disk_bytes:
+                    break
+                self._remove_files(*paths)
+                excess -= 1
+                total -= size
+        except OSError as e:
+            logger.debug(f"TTS disk cache sweep failed: {e}")
+        finally:
+            self._sweep_lock.release()
+
+
 class TTSService:
     """
     Microsoft Edge Neural TTS - High quality voices
@@ -166,10 +536,59 @@ class TTSService:
     - 14+ Indian languages
     """
     
-    def __init__(self):
+    def __init__(self, parallelism: int = TTS_CONCURRENCY):
         self._voices = NEURAL_VOICES
         self._default_gender = VoiceGender.FEMALE
         self._default_speed = SpeechSpeed.NORMAL
+        self._cache = SynthesisCache()
+        self._rate_table = self._build_rate_table()
+        
+        # Pure functions of the voice tables - build once, return the same object
+        self._supported_languages = [
+            {
+                "code": k, 
+                "name": v["name"], 
+                "voice_female": v["voice_female"],
+                "voice_male": v["voice_male"],
+                "fallback": v.get("fallback", False)
+            } 
+            for k, v in self._voices.items()
+        ]
+        self._voice_options = {
+            "genders": [g.value for g in VoiceGender],
+            "speeds": [s.value for s in SpeechSpeed],
+            "speed_descriptions": {
+                "fast": "Faster than normal (+15%)",
+                "normal": "Normal speed",
+                "slow": "Slower for clarity (-20%)",
+                "very_slow": "Very slow for elderly (-35%)"
+            }
+        }
+        # Max concurrent Edge TTS syntheses; one semaphore per event loop
+        self._parallelism = parallelism
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+        self._connectors: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, aiohttp.TCPConnector]" = weakref.WeakKeyDictionary()
+        # Request queue + dispatcher task per event loop
+        self._queues: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Queue]" = weakref.WeakKeyDictionary()
+        self._workers: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Task]" = weakref.WeakKeyDictionary()
+        # In-flight syntheses by cache key, per event loop
+        self._inflight: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Task]]" = weakref.WeakKeyDictionary()
+    
+    def _build_rate_table(self) -> Dict[tuple, str]:
+        """
+        Precompute the Edge TTS rate string for every (language, speed).
+        
+        A user-selected speed uses ONLY that speed adjustment - it isn't
+        stacked on the language base rate, which would make non-English
+        languages extremely slow. The base rate is just the "normal" tuning.
+        """
+        table = {}
+        for lang, config in self._voices.items():
+            base_rate = int(config.get("rate", "+0%").replace("%", "").replace("+", ""))
+            for speed in SpeechSpeed:
+                final_rate = base_rate if speed == SpeechSpeed.NORMAL else SPEED_ADJUSTMENTS.get(speed, 0)
+                table[(lang, speed)] = f"{final_rate:+d}%"
+        return table
     
     def get_voice_for_language(
         self, 
@@ -196,24 +615,290 @@ class TTSService:
         use ONLY that speed adjustment — don't stack on the language base rate,
         which would make it extremely slow for non-English languages.
         """
-        config = self._voices.get(language, self._voices["en"])
-        base_rate = int(config.get("rate", "+0%").replace("%", "").replace("+", ""))
-        
         # Legacy support for old 'slow' parameter
         if slow and speed is None:
             speed = SpeechSpeed.SLOW
         
         speed = speed or self._default_speed
-        adjustment = SPEED_ADJUSTMENTS.get(speed, 0)
+        rate = self._rate_table.get((language, speed))
+        return rate if rate is not None else self._rate_table[("en", speed)]
+    
+    def _resolve_request(
+        self,
+        text: str,
+        language: str,
+        slow: bool,
+        gender: Optional[str],
+        speed: Optional[str]
+    ) -> Optional[tuple]:
+        """
+        Resolve request options to (clean_text, voice, rate, pitch, gender).
+        Returns None when there is nothing to speak.
+        """
+        # Bail out before any option parsing: pure emoji/markdown replies
+        # clean down to nothing
+        clean_text = self._clean_text(text)
+        if not clean_text:
+            return None
+        
+        config = self._voices.get(language, self._voices["en"])
+        
+        # Parse gender (unknown -> female)
+        voice_gender = _GENDER_MAP.get(gender.lower(), VoiceGender.FEMALE) if gender else VoiceGender.FEMALE
+        
+        # Parse speed (unknown -> normal, missing -> language default)
+        speech_speed = _SPEED_MAP.get(speed.lower(), SpeechSpeed.NORMAL) if speed else None
+        
+        voice = self.get_voice_for_language(language, voice_gender)
+        rate = self._calculate_rate(language, speech_speed, slow)
+        pitch = config.get("pitch", "+0Hz")
+        
+        return clean_text, voice, rate, pitch, voice_gender
+    
+    def _semaphore(self) -> asyncio.Semaphore:
+        """Concurrency gate for the running event loop."""
+        loop = asyncio.get_running_loop()
+        sem = self._semaphores.get(loop)
+        if sem is None:
+            sem = self._semaphores[loop] = asyncio.Semaphore(self._parallelism)
+        return sem
+    
+    def _connector(self) -> aiohttp.TCPConnector:
+        """Shared aiohttp connector for the running event loop."""
+        loop = asyncio.get_running_loop()
+        connector = self._connectors.get(loop)
+        if connector is None:
+            connector = self._connectors[loop] = _SharedConnector(limit=32, keepalive_timeout=60)
+        return connector
+    
+    def _communicate(self, text: str, voice: str, rate: str, pitch: str) -> edge_tts.Communicate:
+        """Build an edge_tts Communicate bound to the shared connector."""
+        return edge_tts.Communicate(
+            text=text, voice=voice, rate=rate, pitch=pitch, connector=self._connector()
+        )
+    
+    async def _synthesize_bytes(self, text: str, voice: str, rate: str, pitch: str) -> bytes:
+        """Synthesize text with Edge TTS, collecting the streamed MP3 in memory."""
+        queued_at = time.perf_counter()
+        buf = _AudioBuffer()
+        try:
+            async with self._semaphore():
+                started_at = time.perf_counter()
+                communicate = self._communicate(text, voice, rate, pitch)
+                async for chunk in communicate.stream():
+                    if chunk["type"] == "audio":
+                        buf.append(chunk["data"])
+            
+            # Queue wait vs synthesis time, for tuning TTS_CONCURRENCY
+            finished_at = time.perf_counter()
+            logger.debug(
+                f"TTS synth: wait={(started_at - queued_at) * 1000:.0f}ms, "
+                f"synth={(finished_at - started_at) * 1000:.0f}ms, chars={len(text)}"
+            )
+            return buf.getvalue()
+        finally:
+            buf.release()
+    
+    async def _synthesize_sentences(self, text: str, voice: str, rate: str, pitch: str) -> bytes:
+        """
+        Synthesize each sentence concurrently and join the MP3 streams in order.
+        MP3 frames are self-delimiting, so the parts concatenate cleanly.
+        """
+        sentences = [s for s in _SENTENCE_SPLIT_RE.split(text) if s.strip()]
+        if len(sentences) <= 1:
+            return await self._synthesize_bytes(text, voice, rate, pitch)
+        
+        parts = await asyncio.gather(
+            *(self._synthesize_bytes(s, voice, rate, pitch) for s in sentences)
+        )
+        return b"".join(parts)
+    
+    async def _get_audio(self, text: str, voice: str, rate: str, pitch: str) -> bytes:
+        """Return MP3 bytes for cleaned text, from cache when possible."""
+        cache_key = SynthesisCache.make_key(text, voice, rate, pitch)
+        cached = await self._cache.get(cache_key)
+        if cached is not None:
+            logger.info(f"TTS cache hit: voice={voice}")
+            return cached
         
-        # If user chose a specific speed, use adjustment directly (not stacked)
-        # The base rate is just for "normal" mode tuning per-language
-        if speed != SpeechSpeed.NORMAL:
-            final_rate = adjustment
+        # Coalesce concurrent misses for the same utterance onto one synthesis
+        inflight = self._inflight.get(asyncio.get_running_loop())
+        if inflight is None:
+            inflight = self._inflight[asyncio.get_running_loop()] = {}
+        task = inflight.get(cache_key)
+        if task is None:
+            task = asyncio.create_task(self._fetch_audio(cache_key, text, voice, rate, pitch))
+            inflight[cache_key] = task
+            task.add_done_callback(lambda _: inflight.pop(cache_key, None))
         else:
-            final_rate = base_rate
+            logger.info(f"TTS joined in-flight synthesis: voice={voice}")
         
-        return f"{final_rate:+d}%"
+        # Shield so one caller cancelling doesn't cancel the others' synthesis
+        return await asyncio.shield(task)
+    
+    async def _fetch_audio(self, cache_key: str, text: str, voice: str, rate: str, pitch: str) -> bytes:
+        audio = await self._submit(text, voice, rate, pitch)
+        if audio:
+            self._cache.put(cache_key, audio)
+        return audio
+    
+    async def _submit(self, text: str, voice: str, rate: str, pitch: str) -> bytes:
+        """Queue a synthesis for the dispatcher and wait for its result."""
+        loop = asyncio.get_running_loop()
+        request_queue = self._queues.get(loop)
+        if request_queue is None:
+            request_queue = self._queues[loop] = asyncio.Queue()
+        worker = self._workers.get(loop)
+        if worker is None or worker.done():
+            self._workers[loop] = loop.create_task(self._dispatch(request_queue))
+        
+        future = loop.create_future()
+        await request_queue.put((text, voice, rate, pitch, future))
+        return await future
+    
+    async def _dispatch(self, request_queue: asyncio.Queue):
+        """
+        Single consumer for queued synthesis requests. Each request runs as its
+        own task; the TTS_CONCURRENCY semaphore bounds how many hit Edge TTS.
+        """
+        in_progress = set()  # Strong refs so running tasks aren't garbage collected
+        try:
+            while True:
+                item = await request_queue.get()
+                task = asyncio.create_task(self._process_request(item))
+                in_progress.add(task)
+                task.add_done_callback(in_progress.discard)
+        finally:
+            # Cancelled by shutdown(): stop running syntheses and fail the queue
+            for task in list(in_progress):
+                task.cancel()
+            await asyncio.gather(*in_progress, return_exceptions=True)
+            while not request_queue.empty():
+                *_, future = request_queue.get_nowait()
+                if not future.done():
+                    future.set_exception(RuntimeError("TTS service is shut down"))
+    
+    async def _process_request(self, item: tuple):
+        text, voice, rate, pitch, future = item
+        if future.done():  # Caller gave up while queued
+            return
+        try:
+            audio = await self._synthesize_sentences(text, voice, rate, pitch)
+        except asyncio.CancelledError:
+            if not future.done():
+                future.set_exception(RuntimeError("TTS service is shut down"))
+            raise
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+        else:
+            if not future.done():
+                future.set_result(audio)
+    
+    async def shutdown(self):
+        """
+        Stop the dispatcher on the calling loop and the background loop used by
+        the sync wrappers, failing any syntheses still queued. Call on app exit.
+        """
+        loop = asyncio.get_running_loop()
+        worker = self._workers.pop(loop, None)
+        if worker is not None and not worker.done():
+            worker.cancel()
+            await asyncio.gather(worker, return_exceptions=True)
+        # Let callers coalesced onto failed syntheses see the error
+        inflight = self._inflight.pop(loop, {})
+        await asyncio.gather(*inflight.values(), return_exceptions=True)
+        connector = self._connectors.pop(loop, None)
+        if connector is not None:
+            await connector.close_shared()
+        
+        global _bg_loop
+        with _bg_loop_lock:
+            bg_loop, _bg_loop = _bg_loop, None
+        if bg_loop is not None and bg_loop is not loop:
+            connector = self._connectors.pop(bg_loop, None)
+            if connector is not None:
+                try:
+                    await asyncio.wrap_future(
+                        asyncio.run_coroutine_threadsafe(connector.close_shared(), bg_loop)
+                    )
+                except Exception as e:
+                    logger.warning(f"Failed to close TTS connector: {e}")
+            # Its thread cancels the remaining tasks and closes the loop
+            bg_loop.call_soon_threadsafe(bg_loop.stop)
+    
+    async def warmup(self):
+        """
+        Synthesize a tiny utterance so the first real request doesn't pay for
+        DNS, TLS and WebSocket setup or edge_tts's lazy initialization.
+        """
+        try:
+            await self._synthesize_bytes(
+                "a", self.get_voice_for_language("en"), self._calculate_rate("en"), "+0Hz"
+            )
+            logger.info("✅ TTS warmed up")
+        except Exception as e:
+            logger.warning(f"TTS warmup failed: {e}")
+    
+    async def stream_speech_async(
+        self,
+        text: str,
+        language: str = "en",
+        slow: bool = False,
+        gender: str = None,
+        speed: str = None
+    ) -> AsyncIterator[bytes]:
+        """
+        Stream MP3 chunks as Edge TTS produces them.
+        
+        Lets routes start sending audio after the first packet instead of
+        waiting for the whole synthesis. The full audio is cached at the end.
+        A synthesis slot is held only while Edge TTS is sending: chunks are
+        queued for the caller, so a slow client can't keep the slot.
+        """
+        resolved = self._resolve_request(text, language, slow, gender, speed)
+        if resolved is None:
+            return
+        clean_text, voice, rate, pitch, voice_gender = resolved
+        
+        cache_key = SynthesisCache.make_key(clean_text, voice, rate, pitch)
+        cached = await self._cache.get(cache_key)
+        if cached is not None:
+            logger.info(f"TTS cache hit: voice={voice}")
+            yield cached
+            return
+        
+        communicate = self._communicate(clean_text, voice, rate, pitch)
+        chunks: "asyncio.Queue[Optional[bytes]]" = asyncio.Queue()
+        
+        async def receive():
+            async with self._semaphore():
+                async for chunk in communicate.stream():
+                    if chunk["type"] == "audio":
+                        chunks.put_nowait(chunk["data"])
+        
+        receiver = asyncio.create_task(receive())
+        receiver.add_done_callback(lambda _: chunks.put_nowait(None))  # End of stream
+        buf = _AudioBuffer()
+        try:
+            while True:
+                data = await chunks.get()
+                if data is None:
+                    break
+                buf.append(data)
+                yield data
+            receiver.result()  # Re-raise a failed synthesis
+            
+            if len(buf):
+                self._cache.put(cache_key, buf.getvalue())
+        finally:
+            if receiver.done():
+                if not receiver.cancelled():
+                    receiver.exception()  # Mark retrieved: the caller may have stopped reading
+            else:
+                receiver.cancel()
+            buf.release()
+        logger.info(f"Streamed TTS: voice={voice}, lang={language}, gender={voice_gender.value}, speed={rate}")
     
     async def generate_speech_async(
         self, 
@@ -237,35 +922,17 @@ class TTSService:
             Path to generated audio file (MP3)
         """
         try:
-            config = self._voices.get(language, self._voices["en"])
-            
-            # Parse gender
-            voice_gender = VoiceGender.FEMALE
-            if gender:
-                voice_gender = VoiceGender(gender.lower()) if gender.lower() in ["male", "female"] else VoiceGender.FEMALE
-            
-            # Parse speed
-            speech_speed = None
-            if speed:
-                try:
-                    speech_speed = SpeechSpeed(speed.lower())
-                except ValueError:
-                    speech_speed = SpeechSpeed.NORMAL
-            
-            voice = self.get_voice_for_language(language, voice_gender)
-            rate = self._calculate_rate(language, speech_speed, slow)
-            pitch = config.get("pitch", "+0Hz")
-            
-            clean_text = self._clean_text(text)
-            if not clean_text.strip():
+            resolved = self._resolve_request(text, language, slow, gender, speed)
+            if resolved is None:
                 return None
+            clean_text, voice, rate, pitch, voice_gender = resolved
             
-            temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".mp3")
-            audio_path = temp_file.name
-            temp_file.close()
+            audio = await self._get_audio(clean_text, voice, rate, pitch)
+            if not audio:
+                return None
             
-            communicate = edge_tts.Communicate(text=clean_text, voice=voice, rate=rate, pitch=pitch)
-            await communicate.save(audio_path)
+            # Only callers that need a file path pay for the write - off the loop thread
+            audio_path = await asyncio.to_thread(self._write_tempfile, audio)
             
             logger.info(f"Generated TTS: voice={voice}, lang={language}, gender={voice_gender.value}, speed={rate}")
             return audio_path
@@ -274,16 +941,15 @@ class TTSService:
             logger.error(f"TTS failed: {e}")
             return None
     
+    @staticmethod
+    def _write_tempfile(audio: bytes) -> str:
+        with tempfile.NamedTemporaryFile(delete=False, suffix=".mp3") as temp_file:
+            temp_file.write(audio)
+        return temp_file.name
+    
     def _clean_text(self, text: str) -> str:
         """Clean text for TTS - remove markdown and emojis."""
-        import re
-        clean = text.replace("**", "")
-        clean = re.sub(r'[\U0001F300-\U0001F9FF]', '', clean)
-        clean = re.sub(r'[\u2600-\u26FF]', '', clean)
-        clean = re.sub(r'\n{2,}', '. ', clean)
-        clean = re.sub(r'\n', ', ', clean)
-        clean = re.sub(r'\s+', ' ', clean)
-        return clean.strip()
+        return _clean_text_cached(text)
     
     def generate_speech(
         self, 
@@ -294,14 +960,7 @@ class TTSService:
         speed: str = None
     ) -> str:
         """Sync wrapper for generate_speech_async."""
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
-            return loop.run_until_complete(
-                self.generate_speech_async(text, language, slow, gender, speed)
-            )
-        finally:
-            loop.close()
+        return _run_sync(self.generate_speech_async(text, language, slow, gender, speed))
     
     def generate_speech_bytes(
         self, 
@@ -312,15 +971,7 @@ class TTSService:
         speed: str = None
     ) -> bytes:
         """Generate speech and return bytes."""
-        audio_path = self.generate_speech(text, language, slow, gender, speed)
-        if not audio_path or not os.path.exists(audio_path):
-            return b''
-        try:
-            with open(audio_path, "rb") as f:
-                return f.read()
-        finally:
-            if os.path.exists(audio_path):
-                os.unlink(audio_path)
+        return _run_sync(self.generate_speech_bytes_async(text, language, slow, gender, speed))
     
     async def generate_speech_bytes_async(
         self, 
@@ -331,45 +982,29 @@ class TTSService:
         speed: str = None
     ) -> bytes:
         """Async version for FastAPI routes."""
-        audio_path = await self.generate_speech_async(text, language, slow, gender, speed)
-        if not audio_path or not os.path.exists(audio_path):
-            return b''
         try:
-            with open(audio_path, "rb") as f:
-                return f.read()
-        finally:
-            if os.path.exists(audio_path):
-                os.unlink(audio_path)
+            resolved = self._resolve_request(text, language, slow, gender, speed)
+            if resolved is None:
+                return b''
+            clean_text, voice, rate, pitch, voice_gender = resolved
+            
+            audio = await self._get_audio(clean_text, voice, rate, pitch)
+            logger.info(f"Generated TTS bytes: voice={voice}, lang={language}, gender={voice_gender.value}, speed={rate}")
+            return audio
+        except Exception as e:
+            logger.error(f"TTS failed: {e}")
+            return b''
     
     @property
     def NEURAL_VOICES(self):
         return self._voices
     
     def supported_languages(self) -> List[Dict]:
-        """Get list of supported languages with voice info."""
-        return [
-            {
-                "code": k, 
-                "name": v["name"], 
-                "voice_female": v["voice_female"],
-                "voice_male": v["voice_male"],
-                "fallback": v.get("fallback", False)
-            } 
-            for k, v in self._voices.items()
-        ]
+        """Get list of supported languages with voice info (shared, don't mutate)."""
+        return self._supported_languages
     
     def get_voice_options(self) -> Dict:
-        """Get available voice options for UI."""
-        return {
-            "genders": [g.value for g in VoiceGender],
-            "speeds": [s.value for s in SpeechSpeed],
-            "speed_descriptions": {
-                "fast": "Faster than normal (+15%)",
-                "normal": "Normal speed",
-                "slow": "Slower for clarity (-20%)",
-                "very_slow": "Very slow for elderly (-35%)"
-            }
-        }
-
+        """Get available voice options for UI (shared, don't mutate)."""
+        return self._voice_options
 
 tts_service = TTSService()
@@ -3,9 +3,13 @@ Symptom Analyzer Service
 Analyzes symptoms and generates health recommendations
 """
 
+import heapq
 import logging
 import json
-from typing import List, Optional
+import sys
+from collections import Counter, OrderedDict
+from functools import lru_cache
+from typing import ClassVar, Dict, Final, List, NamedTuple, Optional, Tuple
 from pathlib import Path
 
 from app.models.schemas import (
@@ -16,25 +20,160 @@ from app.models.schemas import (
 )
 from app.config import settings
 
+# Vectorized vitals checks for analyze_batch (optional, falls back to a loop)
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+# Faster JSON parsing for the knowledge graph (optional)
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 logger = logging.getLogger(__name__)
 
+# analyze() results memoized per instance (chat flows re-analyze the same
+# state across turns)
+DIAGNOSIS_CACHE_SIZE = 256
+
+# Parsed knowledge graphs shared by all analyzer instances, keyed by path and
+# validated against the file's (mtime_ns, size)
+_KG_CACHE: Dict[str, Tuple[Tuple[int, int], dict]] = {}
+
+# Fixed recommendation / red-flag text, built once at import
+_EMERGENCY_RECOMMENDATIONS: Final = (
+    "⚠️ SEEK IMMEDIATE MEDICAL ATTENTION",
+    "Call 108 (Ambulance) or go to nearest hospital emergency room",
+    "Do not drive yourself - ask someone to take you",
+)
+_DOCTOR_NEEDED_RECOMMENDATIONS: Final = (
+    "📋 Consult a doctor within 24-48 hours",
+    "Monitor your symptoms and note any changes",
+)
+_SELF_CARE_RECOMMENDATIONS: Final = (
+    "Monitor your symptoms for the next 24-48 hours",
+    "Rest and stay hydrated",
+)
+_FLAG_EMERGENCY_INTENT: Final = "⚠️ CRITICAL: Emergency intent detected"
+_FLAG_LOW_PLATELETS: Final = "⚠️ CRITICAL: Very low platelets"
+_FLAG_SPO2_CRITICAL: Final = "⚠️ CRITICAL: Low blood oxygen (SpO₂ < 90%)"
+_FLAG_SPO2_LOW: Final = "Low blood oxygen"
+_FLAG_HEART_RATE: Final = "Very high heart rate"
+_FLAG_FEVER: Final = "Very high fever (>103°F)"
+
+
+@lru_cache(maxsize=512)
+def _pretty(name: str) -> str:
+    """Display form of a symptom key ('chest_pain' -> 'chest pain')."""
+    return name.replace('_', ' ')
+
+
+class Candidate(NamedTuple):
+    """A knowledge-graph condition matched by the input symptoms"""
+    name: str
+    score: float
+    matched_symptoms: List[str]
+    data: dict
+
 
 class SymptomAnalyzer:
     """Analyze symptoms and generate diagnosis"""
     
+    # Follow-up timeline per urgency level
+    _FOLLOW_UP: ClassVar[Dict[UrgencyLevel, str]] = {
+        UrgencyLevel.EMERGENCY: "Immediately",
+        UrgencyLevel.DOCTOR_NEEDED: "Within 24-48 hours",
+    }
+    _FOLLOW_UP_DEFAULT: ClassVar[str] = "If symptoms persist for more than 2-3 days or worsen"
+    
+    # Symptom-specific self-care advice, added in this order when present
+    _SYMPTOM_RECS: ClassVar[Dict[str, Tuple[str, ...]]] = {
+        'fever': (
+            "Take paracetamol for fever as directed",
+            "Drink plenty of fluids",
+        ),
+        'headache': (
+            "Rest in a quiet, dark room",
+            "Apply cold compress to forehead",
+        ),
+        'cough': (
+            "Drink warm liquids (tea, soup)",
+            "Try steam inhalation",
+        ),
+    }
+    
     def __init__(self):
         self.knowledge_graph = self._load_knowledge_graph()
+        self._build_index(self.knowledge_graph)
     
     def _load_knowledge_graph(self) -> dict:
-        """Load medical knowledge graph"""
+        """Load medical knowledge graph (parsed once per file version)"""
+        self._kg_stamp: Optional[Tuple[int, int]] = None
         try:
             kg_path = Path(settings.KNOWLEDGE_GRAPH_PATH)
-            with open(kg_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            st = kg_path.stat()
+            stamp = (st.st_mtime_ns, st.st_size)
+            
+            cached = _KG_CACHE.get(str(kg_path))
+            if cached is not None and cached[0] == stamp:
+                kg = cached[1]
+            else:
+                raw = kg_path.read_bytes()
+                kg = orjson.loads(raw) if HAS_ORJSON else json.loads(raw)
+                _KG_CACHE[str(kg_path)] = (stamp, kg)
+            
+            self._kg_stamp = stamp
+            return kg
         except Exception as e:
             logger.error(f"Failed to load knowledge graph: {e}")
             return {"symptoms": {}, "conditions": {}}
     
+    def reload_if_changed(self) -> bool:
+        """Reload the knowledge graph if the file changed on disk. Returns True if reloaded."""
+        try:
+            st = Path(settings.KNOWLEDGE_GRAPH_PATH).stat()
+        except OSError:
+            return False
+        if (st.st_mtime_ns, st.st_size) == self._kg_stamp:
+            return False
+        
+        logger.info("Knowledge graph changed on disk, reloading")
+        self.knowledge_graph = self._load_knowledge_graph()
+        self._build_index(self.knowledge_graph)
+        return True
+    
+    def _build_index(self, kg: dict):
+        """
+        Precompute lookup structures from the knowledge graph, which never
+        changes between requests:
+        - _conditions: (name, common_symptoms frozenset, size, data) per condition
+        - _postings: symptom name -> indices into _conditions that list it
+        - _emergency_set / _symptom_table / _conditions_table: hoisted lookups
+        Also resets the diagnosis cache, whose entries depend on the graph.
+        """
+        self._diagnosis_cache: "OrderedDict[tuple, DiagnosisResult]" = OrderedDict()
+        # Keys are interned so lookups with (interned) ExtractedSymptom names
+        # hit the identity fast path
+        self._emergency_set = frozenset(map(sys.intern, kg.get('emergency_conditions', [])))
+        self._symptom_table: Dict[str, dict] = kg.get('symptoms', {})
+        self._conditions_table: Dict[str, dict] = kg.get('conditions', {})
+        
+        self._conditions: List[Tuple[str, frozenset, int, dict]] = []
+        self._postings: Dict[str, List[int]] = {}
+        
+        for condition_name, condition_data in self._conditions_table.items():
+            common_symptoms = frozenset(map(sys.intern, condition_data.get('common_symptoms', [])))
+            if not common_symptoms:
+                continue  # Can never match
+            idx = len(self._conditions)
+            self._conditions.append((sys.intern(condition_name), common_symptoms, len(common_symptoms), condition_data))
+            for symptom_name in common_symptoms:
+                self._postings.setdefault(symptom_name, []).append(idx)
+    
     def analyze(
         self,
         symptoms: List[ExtractedSymptom],
@@ -47,17 +186,62 @@ class SymptomAnalyzer:
         if not symptoms:
             return self._no_symptoms_diagnosis()
         
-        logger.info(f"Analyzing {len(symptoms)} symptoms with vitals={vitals is not None}")
+        # Key on everything the result depends on. Symptom order matters
+        # (flag/question order); stress only matters past the 0.8 threshold.
+        cache_key = (
+            tuple((s.name, s.severity, s.duration, s.confidence) for s in symptoms),
+            vitals and (vitals.spo2, vitals.heart_rate, vitals.temperature),
+            emotion_stress > 0.8
+        )
+        cached = self._diagnosis_cache.get(cache_key)
+        if cached is not None:
+            self._diagnosis_cache.move_to_end(cache_key)
+            return cached.model_copy(deep=True)
         
-        # Check for missing information to generate follow-up questions
-        questions = self._generate_follow_up_questions(symptoms)
+        diagnosis = self._analyze(symptoms, vitals, emotion_stress)
+        
+        self._diagnosis_cache[cache_key] = diagnosis
+        if len(self._diagnosis_cache) > DIAGNOSIS_CACHE_SIZE:
+            self._diagnosis_cache.popitem(last=False)
+        return diagnosis.model_copy(deep=True)
+    
+    def analyze_batch(
+        self,
+        patients: List[Tuple[List[ExtractedSymptom], Optional[VitalsReading], float]]
+    ) -> List[DiagnosisResult]:
+        """
+        Analyze many (symptoms, vitals, emotion_stress) entries at once, e.g.
+        for a triage screen. Vitals thresholds and confidence scores are
+        evaluated for the whole batch in vectorized steps; results are not cached.
+        """
+        vitals_urgency = self._batch_vitals_urgency([vitals for _, vitals, _ in patients])
+        confidences = self._batch_confidence([(symptoms, vitals) for symptoms, vitals, _ in patients])
+        
+        results = []
+        for (symptoms, vitals, emotion_stress), vu, conf in zip(patients, vitals_urgency, confidences):
+            if not symptoms:
+                results.append(self._no_symptoms_diagnosis())
+            else:
+                results.append(self._analyze(symptoms, vitals, emotion_stress, vu, conf))
+        return results
+    
+    def _analyze(
+        self,
+        symptoms: List[ExtractedSymptom],
+        vitals: Optional[VitalsReading],
+        emotion_stress: float,
+        vitals_urgency: Optional[Tuple[float, List[str]]] = None,
+        confidence: Optional[float] = None
+    ) -> DiagnosisResult:
+        """Uncached analysis for a non-empty symptom list"""
+        logger.info("Analyzing %d symptoms with vitals=%s", len(symptoms), vitals is not None)
         
         # Find matching conditions
         possible_conditions = self._match_conditions(symptoms)
         
         # Determine urgency level
         urgency_level, red_flags = self._determine_urgency(
-            symptoms, vitals, possible_conditions, emotion_stress
+            symptoms, vitals, possible_conditions, emotion_stress, vitals_urgency
         )
         
         # Generate recommendations
@@ -65,11 +249,18 @@ class SymptomAnalyzer:
             urgency_level, possible_conditions, symptoms, vitals
         )
         
-        # Calculate confidence
-        confidence = self._calculate_confidence(symptoms, vitals)
+        # Calculate confidence (analyze_batch precomputes it)
+        if confidence is None:
+            confidence = self._calculate_confidence(symptoms, vitals)
         
-        # If we have questions and urgency is NOT emergency, lower confidence and add questions
-        if questions and urgency_level != UrgencyLevel.EMERGENCY:
+        # Check for missing information to generate follow-up questions.
+        # Emergencies never show them, so don't build them there.
+        questions = []
+        if urgency_level != UrgencyLevel.EMERGENCY:
+            questions = self._generate_follow_up_questions(symptoms)
+        
+        # If we have questions, lower confidence and add questions
+        if questions:
             confidence *= 0.8 # Reduce confidence if info is missing
             # Prepend questions to recommendations to make it interactive
             # In a real system, this would be a separate field, but for now we add to response text
@@ -86,7 +277,7 @@ class SymptomAnalyzer:
         diagnosis = DiagnosisResult(
             urgency_level=urgency_level,
             confidence=confidence,
-            possible_conditions=[c['name'] for c in possible_conditions],
+            possible_conditions=[c.name for c in possible_conditions],
             recommendations=recommendations,
             red_flags=red_flags,
             follow_up_timeline=follow_up,
@@ -105,100 +296,94 @@ class SymptomAnalyzer:
                 continue
                 
             if not symptom.severity:
-                questions.append(f"❓ How severe is your {symptom.name.replace('_', ' ')}? (Mild, Moderate, or Severe?)")
+                questions.append(f"❓ How severe is your {_pretty(symptom.name)}? (Mild, Moderate, or Severe?)")
             
             if not symptom.duration:
-                questions.append(f"❓ How long have you had the {symptom.name.replace('_', ' ')}?")
+                questions.append(f"❓ How long have you had the {_pretty(symptom.name)}?")
                 
         return questions[:2] # Limit to 2 questions to avoid overwhelming
     
-    def _match_conditions(self, symptoms: List[ExtractedSymptom]) -> List[dict]:
+    def _match_conditions(self, symptoms: List[ExtractedSymptom]) -> List[Candidate]:
         """Match symptoms to possible conditions"""
         symptom_names = {s.name for s in symptoms}
-        conditions = []
         
-        for condition_name, condition_data in self.knowledge_graph.get('conditions', {}).items():
-            common_symptoms = set(condition_data.get('common_symptoms', []))
-            
-            # Calculate overlap
-            overlap = symptom_names.intersection(common_symptoms)
-            if overlap:
-                match_score = len(overlap) / len(common_symptoms)
-                conditions.append({
-                    'name': condition_name,
-                    'score': match_score,
-                    'matched_symptoms': list(overlap),
-                    'data': condition_data
-                })
-        
-        # Sort by score
-        conditions.sort(key=lambda x: x['score'], reverse=True)
-        
-        return conditions[:3]  # Top 3 conditions
+        # Count overlaps via the inverted index - only conditions that share
+        # at least one symptom are ever visited
+        overlap_counts = Counter()
+        for name in symptom_names:
+            overlap_counts.update(self._postings.get(name, ()))
+        
+        # Score every hit against its precomputed symptom-set size, keep the
+        # top 3 (nlargest is stable over knowledge-graph order, same as sort +
+        # slice), and only build the result entries for those
+        scores = {idx: count / self._conditions[idx][2] for idx, count in overlap_counts.items()}
+        top = heapq.nlargest(3, sorted(scores), key=scores.__getitem__)
+        
+        conditions = []
+        for idx in top:
+            condition_name, common_symptoms, _, condition_data = self._conditions[idx]
+            conditions.append(Candidate(
+                condition_name,
+                scores[idx],
+                list(symptom_names & common_symptoms),
+                condition_data
+            ))
+        return conditions
     
     def _determine_urgency(
         self,
         symptoms: List[ExtractedSymptom],
         vitals: Optional[VitalsReading],
-        conditions: List[dict],
-        emotion_stress: float
+        conditions: List[Candidate],
+        emotion_stress: float,
+        vitals_urgency: Optional[Tuple[float, List[str]]] = None
     ) -> tuple:
         """Determine urgency level"""
         red_flags = []
         urgency_score = 0.0
         
-        logger.info(f"Determining urgency for symptoms: {[s.name for s in symptoms]}")
+        # Lazy %-formatting; the name list is only built when INFO is enabled
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Determining urgency for symptoms: %s", [s.name for s in symptoms])
         
-        # Check emergency symptoms
-        emergency_symptoms = self.knowledge_graph.get('emergency_conditions', [])
+        # Single pass over symptoms: emergency / special cases, then severity.
+        # Severity flags are collected separately so they still follow the
+        # emergency flags in the output.
+        emergency_symptoms = self._emergency_set
+        severity_flags = []
         for symptom in symptoms:
+            severe = symptom.severity == 'severe'
+            
             if symptom.name in emergency_symptoms:
                 red_flags.append(f"Emergency symptom detected: {symptom.name}")
                 urgency_score += 3.0
             
             # Special handling for new emergency intent
             if symptom.name == 'emergency_condition':
-                red_flags.append("⚠️ CRITICAL: Emergency intent detected")
+                red_flags.append(_FLAG_EMERGENCY_INTENT)
                 urgency_score += 10.0  # Immediate emergency
             
-            if symptom.name == 'low_platelets' and symptom.severity == 'severe':
-                red_flags.append("⚠️ CRITICAL: Very low platelets")
+            if symptom.name == 'low_platelets' and severe:
+                red_flags.append(_FLAG_LOW_PLATELETS)
                 urgency_score += 3.0
             
-            if symptom.name == 'infection' and symptom.severity == 'severe':
+            if symptom.name == 'infection' and severe:
                 red_flags.append("Severe infection markers")
                 urgency_score += 2.0
-
-        # Check symptom severity
-        for symptom in symptoms:
-            symptom_data = self.knowledge_graph.get('symptoms', {}).get(symptom.name, {})
-            urgency_factors = symptom_data.get('urgency_factors', {})
             
-            if symptom.severity == 'severe':
+            # Check symptom severity
+            if severe:
                 urgency_score += 1.5
-                red_flags.append(f"Severe {symptom.name}")
+                severity_flags.append(f"Severe {symptom.name}")
             
-            # Check specific urgency factors
-            # Only count if we have evidence (which we don't have in current ExtractedSymptom)
-            # So we skip this for now to avoid false positives
-            pass
+            # KG urgency_factors are not scored: ExtractedSymptom carries no
+            # evidence for them, so counting them would give false positives
+        red_flags.extend(severity_flags)
         
-        # Check vitals for abnormalities
-        if vitals:
-            if vitals.spo2 and vitals.spo2 < 90:
-                red_flags.append("⚠️ CRITICAL: Low blood oxygen (SpO₂ < 90%)")
-                urgency_score += 3.0
-            elif vitals.spo2 and vitals.spo2 < 95:
-                red_flags.append("Low blood oxygen")
-                urgency_score += 1.5
-            
-            if vitals.heart_rate and vitals.heart_rate > 120:
-                red_flags.append("Very high heart rate")
-                urgency_score += 1.5
-            
-            if vitals.temperature and vitals.temperature > 103:
-                red_flags.append("Very high fever (>103°F)")
-                urgency_score += 2.0
+        # Check vitals for abnormalities (analyze_batch precomputes these)
+        vitals_score, vitals_flags = vitals_urgency or self._vitals_urgency(vitals)
+        urgency_score += vitals_score
+        red_flags.extend(vitals_flags)
         
         # Check emotion stress
         if emotion_stress > 0.8:
@@ -213,13 +398,67 @@ class SymptomAnalyzer:
         else:
             urgency_level = UrgencyLevel.SELF_CARE
         
-        logger.info(f"Urgency calculation: score={urgency_score}, level={urgency_level}, red_flags={red_flags}")
+        logger.info("Urgency calculation: score=%s, level=%s, red_flags=%s", urgency_score, urgency_level, red_flags)
         return urgency_level, red_flags
     
+    def _vitals_urgency(self, vitals: Optional[VitalsReading]) -> Tuple[float, List[str]]:
+        """Urgency score and red flags contributed by abnormal vitals"""
+        score = 0.0
+        flags = []
+        if vitals:
+            if vitals.spo2 and vitals.spo2 < 90:
+                flags.append(_FLAG_SPO2_CRITICAL)
+                score += 3.0
+            elif vitals.spo2 and vitals.spo2 < 95:
+                flags.append(_FLAG_SPO2_LOW)
+                score += 1.5
+            
+            if vitals.heart_rate and vitals.heart_rate > 120:
+                flags.append(_FLAG_HEART_RATE)
+                score += 1.5
+            
+            if vitals.temperature and vitals.temperature > 103:
+                flags.append(_FLAG_FEVER)
+                score += 2.0
+        return score, flags
+    
+    def _batch_vitals_urgency(
+        self,
+        vitals_list: List[Optional[VitalsReading]]
+    ) -> List[Tuple[float, List[str]]]:
+        """_vitals_urgency for many readings, thresholds evaluated as NumPy masks"""
+        if not HAS_NUMPY or not vitals_list:
+            return [self._vitals_urgency(v) for v in vitals_list]
+        
+        # Missing (or zero) readings become NaN, which fails every comparison
+        nan = float('nan')
+        arr = np.array(
+            [
+                (v.spo2 or nan, v.heart_rate or nan, v.temperature or nan) if v else (nan, nan, nan)
+                for v in vitals_list
+            ],
+            dtype=np.float64
+        )
+        spo2, heart_rate, temperature = arr.T
+        
+        masks = np.column_stack((
+            spo2 < 90,
+            (spo2 >= 90) & (spo2 < 95),
+            heart_rate > 120,
+            temperature > 103,
+        ))
+        scores = masks @ np.array([3.0, 1.5, 1.5, 2.0])
+        
+        flag_text = (_FLAG_SPO2_CRITICAL, _FLAG_SPO2_LOW, _FLAG_HEART_RATE, _FLAG_FEVER)
+        return [
+            (score, [text for text, hit in zip(flag_text, row) if hit])
+            for score, row in zip(scores.tolist(), masks.tolist())
+        ]
+    
     def _generate_recommendations(
         self,
         urgency_level: UrgencyLevel,
-        conditions: List[dict],
+        conditions: List[Candidate],
         symptoms: List[ExtractedSymptom],
         vitals: Optional[VitalsReading]
     ) -> List[str]:
@@ -227,39 +466,25 @@ class SymptomAnalyzer:
         recommendations = []
         
         if urgency_level == UrgencyLevel.EMERGENCY:
-            recommendations.append("⚠️ SEEK IMMEDIATE MEDICAL ATTENTION")
-            recommendations.append("Call 108 (Ambulance) or go to nearest hospital emergency room")
-            recommendations.append("Do not drive yourself - ask someone to take you")
-            return recommendations
+            return list(_EMERGENCY_RECOMMENDATIONS)
         
         # Get recommendations from matched conditions
         if conditions:
             top_condition = conditions[0]
-            condition_recommendations = top_condition['data'].get('recommendations', {}).get('en', [])
+            condition_recommendations = top_condition.data.get('recommendations', {}).get('en', [])
             recommendations.extend(condition_recommendations)
         
         # Add general recommendations based on urgency
         if urgency_level == UrgencyLevel.DOCTOR_NEEDED:
-            recommendations.append("📋 Consult a doctor within 24-48 hours")
-            recommendations.append("Monitor your symptoms and note any changes")
+            recommendations.extend(_DOCTOR_NEEDED_RECOMMENDATIONS)
         else:
-            recommendations.append("Monitor your symptoms for the next 24-48 hours")
-            recommendations.append("Rest and stay hydrated")
+            recommendations.extend(_SELF_CARE_RECOMMENDATIONS)
         
         # Symptom-specific recommendations
-        symptom_names = [s.name for s in symptoms]
-        
-        if 'fever' in symptom_names:
-            recommendations.append("Take paracetamol for fever as directed")
-            recommendations.append("Drink plenty of fluids")
-        
-        if 'headache' in symptom_names:
-            recommendations.append("Rest in a quiet, dark room")
-            recommendations.append("Apply cold compress to forehead")
-        
-        if 'cough' in symptom_names:
-            recommendations.append("Drink warm liquids (tea, soup)")
-            recommendations.append("Try steam inhalation")
+        symptom_names = {s.name for s in symptoms}
+        for name, recs in self._SYMPTOM_RECS.items():
+            if name in symptom_names:
+                recommendations.extend(recs)
         
         # Vitals-based recommendations
         if vitals:
@@ -267,14 +492,7 @@ class SymptomAnalyzer:
                 recommendations.append("Keep yourself cool, use light clothing")
         
         # Remove duplicates while preserving order
-        seen = set()
-        unique_recommendations = []
-        for rec in recommendations:
-            if rec not in seen:
-                seen.add(rec)
-                unique_recommendations.append(rec)
-        
-        return unique_recommendations[:8]  # Max 8 recommendations
+        return list(dict.fromkeys(recommendations))[:8]  # Max 8 recommendations
     
     def _calculate_confidence(
         self,
@@ -301,14 +519,38 @@ class SymptomAnalyzer:
         
         return min(confidence, 0.95)  # Cap at 0.95
     
+    def _batch_confidence(
+        self,
+        entries: List[Tuple[List[ExtractedSymptom], Optional[VitalsReading]]]
+    ) -> List[float]:
+        """_calculate_confidence for many (symptoms, vitals) pairs at once"""
+        if not HAS_NUMPY or not entries:
+            return [self._calculate_confidence(symptoms, vitals) for symptoms, vitals in entries]
+        
+        n = len(entries)
+        counts = np.fromiter((len(symptoms) for symptoms, _ in entries), dtype=np.int64, count=n)
+        has_vitals = np.fromiter((bool(vitals) for _, vitals in entries), dtype=bool, count=n)
+        
+        base = 0.5 + 0.2 * (counts >= 3) + 0.1 * (counts == 2) + 0.2 * has_vitals
+        
+        # Ragged per-patient mean of symptom confidences, as a zero-padded
+        # (patients x max symptoms) matrix. Columns are summed left to right
+        # so results match the scalar sum() bit for bit (np.sum reorders).
+        padded = np.zeros((n, int(counts.max())))
+        for i, (symptoms, _) in enumerate(entries):
+            padded[i, :len(symptoms)] = [s.confidence for s in symptoms]
+        sums = np.zeros(n)
+        for column in padded.T:
+            sums += column
+        avg = sums / np.maximum(counts, 1)
+        
+        # Patients without symptoms keep the base confidence
+        confidence = np.where(counts > 0, (base + avg) / 2, base)
+        return np.minimum(confidence, 0.95).tolist()  # Cap at 0.95
+    
     def _determine_follow_up(self, urgency_level: UrgencyLevel) -> str:
         """Determine follow-up timeline"""
-        if urgency_level == UrgencyLevel.EMERGENCY:
-            return "Immediately"
-        elif urgency_level == UrgencyLevel.DOCTOR_NEEDED:
-            return "Within 24-48 hours"
-        else:
-            return "If symptoms persist for more than 2-3 days or worsen"
+        return self._FOLLOW_UP.get(urgency_level, self._FOLLOW_UP_DEFAULT)
     
     def _no_symptoms_diagnosis(self) -> DiagnosisResult:
         """Diagnosis when no symptoms are identified"""
@@ -327,5 +569,7 @@ class SymptomAnalyzer:
         )
 
 
-# Global instance
-symptom_analyzer = SymptomAnalyzer()
+@lru_cache(maxsize=1)
+def get_symptom_analyzer() -> SymptomAnalyzer:
+    """Shared analyzer, built on first use so importing this module does no I/O"""
+    return SymptomAnalyzer()
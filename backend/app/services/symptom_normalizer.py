@@ -10,12 +10,288 @@ Comprehensive symptom normalization with:
 """
 
 import re
+import sys
 import logging
-from typing import List, Dict, Set, Optional, Tuple
-from difflib import SequenceMatcher
+import unicodedata
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, ClassVar, List, Dict, NamedTuple, Optional, Tuple
+
+# C++ fuzzy string matching (optional, falls back to a pure-Python BK-tree)
+try:
+    from rapidfuzz import fuzz, process
+    HAS_RAPIDFUZZ = True
+except ImportError:
+    HAS_RAPIDFUZZ = False
+
+# Needed for rapidfuzz's batched cdist scores (optional)
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
 
 logger = logging.getLogger(__name__)
 
+# Normalized messages remembered per normalizer instance (chat input repeats a lot)
+NORMALIZE_CACHE_SIZE = 4096
+
+# Fuzzy-match results remembered per word (the same misspellings recur
+# across otherwise different messages)
+FUZZY_CACHE_SIZE = 4096
+_NOT_CACHED = object()
+
+# Everyday words never fuzzy-matched: they aren't typos of anything, and
+# several sit within the threshold of a symptom ('feeling' ~ 'peeling',
+# 'could' ~ 'cold', 'ever' ~ 'fever', 'should' ~ 'shoulder')
+_STOPWORDS = frozenset({
+    # English
+    "about", "above", "after", "again", "against", "also", "always", "been",
+    "before", "being", "below", "between", "both", "cannot", "could", "days",
+    "doctor", "does", "doing", "during", "each", "even", "evening",
+    "ever", "every", "feel", "feeling", "feels", "from", "further", "getting",
+    "have", "having", "help", "here", "hours", "into", "just", "know", "like",
+    "little", "made", "make", "many", "maybe", "minutes", "more", "morning",
+    "most", "much", "myself", "need", "never", "night", "only", "other", "over",
+    "please", "really", "said", "same", "should", "since", "some", "sometimes",
+    "started", "still", "such", "than", "thank", "thanks", "that", "their",
+    "them", "then", "there", "these", "they", "thing", "things", "think", "this",
+    "those", "though", "through", "today", "together", "tomorrow", "under",
+    "until", "very", "want", "week", "weeks", "were", "what", "when", "where",
+    "which", "while", "with", "without", "would", "year", "years", "yesterday",
+    "your", "yours",
+    # Hindi (romanized)
+    "abhi", "bahut", "hota", "kuch", "mujhe", "nahi", "raha", "rahi", "thoda",
+})
+
+# A word as it appears in variations: letters/digits plus ' and - ("can't", "head-ache")
+_TOKEN_RE = re.compile(r"[\w'-]+")
+_WORD_CHAR_RE = re.compile(r"[\w'-]")
+
+# Inflections a phrase may carry at its end and still match, the same rule
+# as triage: "chest pains" is "chest pain". "es" only follows s/x/z/ch/sh/o
+# and a final "e" only takes s/d
+_WORD_END = r"(?:s|ed|ing)?(?![\w'-])"
+_WORD_END_SIBILANT = r"(?:es|ed|ing)?(?![\w'-])"
+_WORD_END_O = r"(?:s|es|ed|ing)?(?![\w'-])"
+_WORD_END_E = r"(?:s|d)?(?![\w'-])"
+_WORD_END_PLAIN = r"(?![\w'-])"
+_WORD_END_RE = re.compile(_WORD_END)
+_WORD_END_SIBILANT_RE = re.compile(_WORD_END_SIBILANT)
+_WORD_END_O_RE = re.compile(_WORD_END_O)
+_WORD_END_E_RE = re.compile(_WORD_END_E)
+_WORD_END_PLAIN_RE = re.compile(_WORD_END_PLAIN)
+
+# The same choice inside one regex, keyed on the phrase's last characters
+_WORD_END_LOOKBEHIND = (
+    r"(?:(?:(?<=[sxz])|(?<=ch)|(?<=sh))" + _WORD_END_SIBILANT
+    + r"|(?<=o)" + _WORD_END_O
+    + r"|(?<=e)" + _WORD_END_E
+    + r"|(?<=\w)(?<![sxzoe])(?<!ch)(?<!sh)" + _WORD_END
+    + r"|(?<!\w)" + _WORD_END_PLAIN + ")"
+)
+
+
+def _word_end(text: str, start: int, end: int) -> int:
+    """
+    Where text[start:end] ends as whole words, past any inflection
+    ('chest pain' in 'chest pains'), or -1 if it starts or ends inside a
+    longer word ('gas' in 'gasoline')
+    """
+    if start > 0 and _WORD_CHAR_RE.match(text, start - 1):
+        return -1
+    if not re.match(r"\w", text[end - 1]):
+        word_end = _WORD_END_PLAIN_RE
+    elif text.endswith(("s", "x", "z", "ch", "sh"), start, end):
+        word_end = _WORD_END_SIBILANT_RE
+    elif text.endswith("o", start, end):
+        word_end = _WORD_END_O_RE
+    elif text.endswith("e", start, end):
+        word_end = _WORD_END_E_RE
+    else:
+        word_end = _WORD_END_RE
+    m = word_end.match(text, end)
+    return m.end() if m else -1
+
+
+def _at_word_boundaries(text: str, start: int, end: int) -> bool:
+    """Whether text[start:end] is whole words, maybe inflected, not part of a longer one"""
+    return _word_end(text, start, end) != -1
+
+
+def _contains_words(text: str, phrase: str) -> bool:
+    """Whether phrase occurs in text as whole words ('cold' not in 'scolded', but in 'colds')"""
+    start = text.find(phrase)
+    while start != -1:
+        if _at_word_boundaries(text, start, start + len(phrase)):
+            return True
+        start = text.find(phrase, start + 1)
+    return False
+
+
+
+def _fold_unicode(text: str) -> str:
+    """
+    Canonical Unicode form for matching: NFC, so composed and decomposed
+    input compare equal, and romanized text typed with diacritics
+    ("bukhār", "févér") folded to plain ASCII like the variation table.
+    Native-script text keeps its combining marks. ASCII input is returned as is.
+    """
+    if text.isascii():
+        return text
+    stripped = ''.join(c for c in unicodedata.normalize('NFD', text) if not unicodedata.combining(c))
+    if stripped.isascii():
+        return stripped
+    return unicodedata.normalize('NFC', text)
+
+
+def _match_form(text: str) -> str:
+    """
+    Input as the lookup tables store it: folded, lowercased, stripped.
+    Plain ASCII (nearly every message) skips folding; str.lower() is
+    already an ASCII fast path in CPython, quicker than a bytes.translate
+    round trip.
+    """
+    if not text.isascii():
+        text = _fold_unicode(text)
+    return text.lower().strip()
+
+
+def _trie_regex(words) -> str:
+    """
+    One regex for a set of words, factored along their shared prefixes
+    ("head(?:ache|ache bad)" style) so re walks a trie instead of trying
+    every alternative at each position. Where a word ends inside a longer
+    one the continuation is tried first, and siblings never share a first
+    character, so the match at each position is the longest word there.
+    """
+    trie: Dict[str, Any] = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = None  # Word ends here
+    
+    def emit(node: Dict[str, Any]) -> str:
+        branches = [re.escape(char) + emit(child) for char, child in node.items() if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 and '' not in node else '(?:' + '|'.join(branches) + ')'
+        return body + '?' if '' in node else body
+    
+    return emit(trie)
+
+
+# Aho-Corasick automaton for the variation scan (optional, falls back to a regex)
+try:
+    import ahocorasick
+    HAS_AHOCORASICK = True
+except ImportError:
+    HAS_AHOCORASICK = False
+
+# Hyperscan SIMD literal matcher for ASCII messages (optional, x86 only)
+try:
+    import hyperscan
+    HAS_HYPERSCAN = True
+except ImportError:
+    HAS_HYPERSCAN = False
+
+
+def _char_masks(a: str) -> Dict[str, int]:
+    """Bit i of masks[c] set where a[i] == c (the bit-parallel LCS pattern)"""
+    masks: Dict[str, int] = {}
+    for i, char in enumerate(a):
+        masks[char] = masks.get(char, 0) | (1 << i)
+    return masks
+
+
+def _indel_distance(a: str, b: str, masks: Optional[Dict[str, int]] = None) -> int:
+    """
+    Insert/delete edit distance (len(a) + len(b) - 2 * LCS), the metric
+    behind rapidfuzz's fuzz.ratio. LCS by the bit-parallel method: one
+    big-int update per character of b. Pass _char_masks(a) when comparing
+    one word against many.
+    """
+    if masks is None:
+        masks = _char_masks(a)
+    full = (1 << len(a)) - 1
+    row = full
+    for char in b:
+        matched = row & masks.get(char, 0)
+        row = ((row + matched) | (row - matched)) & full
+    lcs = len(a) - row.bit_count()
+    return len(a) + len(b) - 2 * lcs
+
+
+class _BKTree:
+    """
+    Burkhard-Keller tree over the fuzzy candidates: a query within radius r
+    only descends into children whose edge distance is within r of the
+    query's distance to the node (triangle inequality), so most candidates
+    are never compared.
+    """
+    
+    def __init__(self, candidates):
+        self._root = None  # [word, first candidate index, {distance: child}]
+        for index, word in candidates:
+            self._add(word, index)
+    
+    def _add(self, word: str, index: int):
+        if self._root is None:
+            self._root = [word, index, {}]
+            return
+        node = self._root
+        while True:
+            distance = _indel_distance(word, node[0])
+            if distance == 0:
+                return  # Repeated word: keep the earliest index
+            child = node[2].get(distance)
+            if child is None:
+                node[2][distance] = [word, index, {}]
+                return
+            node = child
+    
+    def find(self, word: str, radius: int, masks: Optional[Dict[str, int]] = None) -> List[Tuple[int, int]]:
+        """(distance, candidate index) for every word within radius"""
+        if masks is None:
+            masks = _char_masks(word)
+        found = []
+        stack = [self._root] if self._root is not None else []
+        while stack:
+            node = stack.pop()
+            distance = _indel_distance(word, node[0], masks)
+            if distance <= radius:
+                found.append((distance, node[1]))
+            for edge, child in node[2].items():
+                if distance - radius <= edge <= distance + radius:
+                    stack.append(child)
+        return found
+
+
+class _VariationTables(NamedTuple):
+    """
+    Lookup structures derived from the class vocabularies (read-only).
+    Canonical symptoms are int ids into canonical_names, resolved to
+    strings only for output.
+    """
+    canonical_names: Tuple[str, ...]  # CANONICAL_SYMPTOMS order first, so ids sort like the list
+    listed_count: int              # How many ids come from CANONICAL_SYMPTOMS
+    variation_to_id: Dict[str, int]
+    single_token: Dict[str, int]   # One-word variations, matched per token
+    # Fuzzy-match candidates as parallel columns: the words (rapidfuzz
+    # choices / tree keys) and the canonical id each one maps to
+    fuzzy_words: Tuple[str, ...]
+    fuzzy_ids: Tuple[int, ...]
+    fuzzy_trees: Dict[int, _BKTree]  # Over fuzzy_words by length, when rapidfuzz is missing
+    automaton: Any                 # ahocorasick.Automaton, when available
+    pattern: Optional[re.Pattern]  # Regex fallback otherwise
+    hyperscan_db: Any              # hyperscan.Database over the phrases, when available
+    phrase_ids: Tuple[int, ...]    # Hyperscan expression id -> canonical id
+    phrase_starts: Optional[frozenset]  # First word of every phrase (None: no guard)
+    canonical_automaton: Any       # Every canonical name, for the final pass (ahocorasick only)
+    canonical_pattern: Optional[re.Pattern]  # Regex for the same pass otherwise, when exact
+    canonical_ids: Dict[str, int]  # Canonical name -> id
+
 
 class SymptomNormalizer:
     """
@@ -42,7 +318,7 @@ class SymptomNormalizer:
         # Gastrointestinal
         "stomach pain", "nausea", "vomiting", "diarrhea", "constipation",
         "bloating", "gas", "acidity", "heartburn", "indigestion",
-        "abdominal cramps", "loss of appetite",
+        "abdominal cramps",
         
         # Pain
         "back pain", "neck pain", "joint pain", "muscle pain", "chest pain",
@@ -58,11 +334,11 @@ class SymptomNormalizer:
         "mood swings", "irritability", "loneliness", "hopelessness",
         
         # ENT
-        "ear pain", "hearing loss", "tinnitus", "nasal congestion",
+        "hearing loss", "tinnitus", "nasal congestion",
         "sinus pain", "post nasal drip", "hoarseness",
         
         # Eyes
-        "eye pain", "blurred vision", "eye redness", "watery eyes",
+        "blurred vision", "eye redness", "watery eyes",
         "eye itching", "light sensitivity",
         
         # Urinary
@@ -70,7 +346,7 @@ class SymptomNormalizer:
         "urinary urgency", "incontinence", "abnormal urine color",
         
         # Cardiovascular
-        "palpitations", "rapid heartbeat", "slow heartbeat", "chest pain",
+        "palpitations", "rapid heartbeat", "slow heartbeat",
         "shortness of breath", "leg swelling",
         
         # Other
@@ -721,25 +997,229 @@ class SymptomNormalizer:
         ],
     }
     
+    # Built once per class on first instantiation and shared by every instance
+    _tables: ClassVar[Optional[_VariationTables]] = None
+    
     def __init__(self):
-        """Initialize the normalizer with lookup tables"""
-        # Build reverse lookup: variation -> canonical
-        self._variation_to_canonical: Dict[str, str] = {}
-        self._build_variation_lookup()
+        """Initialize the normalizer with the shared lookup tables"""
+        tables = self._ensure_built()
+        self._canonical_names = tables.canonical_names
+        self._listed_count = tables.listed_count
+        self._variation_to_id = tables.variation_to_id
+        self._single_token = tables.single_token
+        self._fuzzy_words = tables.fuzzy_words
+        self._fuzzy_ids = tables.fuzzy_ids
+        self._fuzzy_trees = tables.fuzzy_trees
+        self._automaton = tables.automaton
+        self._pattern = tables.pattern
+        self._hyperscan_db = tables.hyperscan_db
+        self._phrase_ids = tables.phrase_ids
+        self._phrase_starts = tables.phrase_starts
+        self._canonical_automaton = tables.canonical_automaton
+        self._canonical_pattern = tables.canonical_pattern
+        self._canonical_ids = tables.canonical_ids
+        # Per instance, so the cache never outlives (or mixes) its tables
+        self._normalize_cached = lru_cache(maxsize=NORMALIZE_CACHE_SIZE)(self._normalize_folded)
+        self._fuzzy_cache: "OrderedDict[Tuple[str, float], Optional[int]]" = OrderedDict()
+    
+    @classmethod
+    def _ensure_built(cls) -> _VariationTables:
+        """Return the class's lookup tables, building them on first use"""
+        tables = cls.__dict__.get('_tables')  # Not inherited: subclasses may change the vocabularies
+        if tables is None:
+            tables = cls._tables = cls._build_variation_lookup()
+            logger.info(f"SymptomNormalizer initialized with {len(tables.variation_to_id)} variations")
+        return tables
+    
+    @classmethod
+    def _build_variation_lookup(cls) -> _VariationTables:
+        """Build reverse lookup from variations to canonical symptoms"""
+        # Interned so the names handed out compare on the identity fast path
+        listed = dict.fromkeys(map(sys.intern, cls.CANONICAL_SYMPTOMS))
+        if len(listed) != len(cls.CANONICAL_SYMPTOMS):
+            logger.warning(f"CANONICAL_SYMPTOMS lists {len(cls.CANONICAL_SYMPTOMS) - len(listed)} symptoms more than once")
+        canonical_names = tuple(dict.fromkeys([*listed, *map(sys.intern, cls.SYMPTOM_VARIATIONS)]))
+        canonical_id = {canonical: i for i, canonical in enumerate(canonical_names)}
+        
+        variation_to_id: Dict[str, int] = {}
+        collisions: Dict[str, List[str]] = {}
+        for canonical, variations in cls.SYMPTOM_VARIATIONS.items():
+            cid = canonical_id[canonical]
+            
+            # The canonical form itself, then its variations. Keys get the
+            # same Unicode folding as the input, so lookups compare like with like.
+            for variation in (canonical, *variations):
+                key = _fold_unicode(variation.lower())
+                previous = variation_to_id.get(key)
+                if previous is not None and previous != cid:
+                    collisions.setdefault(key, [canonical_names[previous]]).append(canonical)
+                variation_to_id[key] = cid
+        
+        if collisions:
+            # Later entries win; surfaced so ambiguous vocabulary gets fixed
+            # instead of silently remapping
+            summary = ', '.join(f"'{key}' ({' -> '.join(owners)})" for key, owners in collisions.items())
+            logger.warning(f"{len(collisions)} symptom variations map to more than one symptom: {summary}")
+        
+        # One-word variations (most of the table) are plain dict lookups
+        # against the message's tokens; only phrases need a substring scan
+        single_token = {v: c for v, c in variation_to_id.items() if _TOKEN_RE.fullmatch(v)}
+        phrases = {v: c for v, c in variation_to_id.items() if v not in single_token}
+        
+        # One automaton over every phrase: a single pass over the text
+        # reports all of them
+        automaton = None
+        pattern = None
+        canonical_automaton = None
+        canonical_pattern = None
+        if HAS_AHOCORASICK:
+            automaton = ahocorasick.Automaton()
+            for variation, canonical in phrases.items():
+                automaton.add_word(variation, (len(variation), canonical))
+            automaton.make_automaton()
+            
+            # Likewise for the final "canonical name anywhere in the text" pass
+            canonical_automaton = ahocorasick.Automaton()
+            for canonical in listed:
+                canonical_automaton.add_word(canonical, canonical_id[canonical])
+            canonical_automaton.make_automaton()
+        else:
+            # Same leftmost-longest semantics from one prefix-factored regex,
+            # anchored to word boundaries like the automaton's hits
+            pattern = re.compile(r"(?<![\w'-])(" + _trie_regex(phrases) + ")" + _WORD_END_LOOKBEHIND)
+            
+            # The final pass must report overlapping names ('congestion' inside
+            # 'nasal congestion'): a zero-width lookahead tried at every
+            # position does that, one name per start. Exact only if no name,
+            # inflected or not, is a whole-word prefix of another; otherwise
+            # the loop is kept.
+            prefix_free = not any(
+                longer.startswith(name) and _at_word_boundaries(longer, 0, len(name))
+                for name in listed for longer in listed if len(longer) > len(name)
+            )
+            if prefix_free:
+                canonical_pattern = re.compile(r"(?=(?<![\w'-])(" + _trie_regex(listed) + ")" + _WORD_END_LOOKBEHIND + ")")
+        
+        # A phrase only matches at a word boundary, so its first word is then
+        # one of the message's tokens: messages sharing no token with these
+        # can't contain any phrase
+        first_words = [_TOKEN_RE.match(phrase) for phrase in phrases]
+        phrase_starts = None
+        if all(first_words):
+            phrase_starts = frozenset(word.group() for word in first_words)
+        
+        # Hyperscan reports byte offsets, so it only takes ASCII messages
+        # (nearly all of them); the automaton or regex covers the rest
+        hyperscan_db = None
+        phrase_ids: Tuple[int, ...] = ()
+        if HAS_HYPERSCAN and phrases:
+            phrase_ids = tuple(phrases.values())
+            hyperscan_db = hyperscan.Database()
+            hyperscan_db.compile(
+                expressions=[phrase.encode() for phrase in phrases],
+                ids=list(range(len(phrase_ids))),
+                elements=len(phrase_ids),
+                flags=hyperscan.HS_FLAG_SOM_LEFTMOST,
+                literal=True
+            )
+        
+        # Fuzzy-match candidates, in comparison order: every word of every
+        # canonical symptom, then single-word variations among the first 500
+        # (limit for performance). Listed order, not set order, so ties
+        # resolve the same way in every process.
+        fuzzy_candidates = [
+            (sym_word, canonical_id[symptom]) for symptom in listed for sym_word in symptom.split()
+        ]
+        fuzzy_candidates.extend(
+            (variation, variation_to_id[variation])
+            for variation in list(variation_to_id)[:500]
+            if len(variation.split()) == 1
+        )
+        
+        fuzzy_words, fuzzy_ids = (tuple(column) for column in zip(*fuzzy_candidates))
         
-        # All canonical symptoms set for fuzzy matching
-        self._canonical_set = set(self.CANONICAL_SYMPTOMS)
+        # One BK-tree per word length: lengths too far apart to reach the
+        # threshold are skipped without touching their tree
+        fuzzy_trees: Dict[int, _BKTree] = {}
+        if not HAS_RAPIDFUZZ:
+            by_length: Dict[int, List[Tuple[int, str]]] = {}
+            for index, word in enumerate(fuzzy_words):
+                by_length.setdefault(len(word), []).append((index, word))
+            fuzzy_trees = {length: _BKTree(candidates) for length, candidates in by_length.items()}
         
-        logger.info(f"SymptomNormalizer initialized with {len(self._variation_to_canonical)} variations")
+        return _VariationTables(
+            canonical_names,
+            len(listed),
+            variation_to_id,
+            single_token,
+            fuzzy_words,
+            fuzzy_ids,
+            fuzzy_trees,
+            automaton,
+            pattern,
+            hyperscan_db,
+            phrase_ids,
+            phrase_starts,
+            canonical_automaton,
+            canonical_pattern,
+            canonical_id
+        )
     
-    def _build_variation_lookup(self):
-        """Build reverse lookup from variations to canonical symptoms"""
-        for canonical, variations in self.SYMPTOM_VARIATIONS.items():
-            # Add the canonical form itself
-            self._variation_to_canonical[canonical.lower()] = canonical
+    def _find_variations(self, text: str) -> Tuple[List[Tuple[int, int, int]], List[str]]:
+        """
+        Find known variations in text as (start, end, canonical id) spans,
+        returned with the text's tokens for the later passes.
+        Variations match whole words only ('gas' not in 'gasoline', 'sar
+        dard' not in 'sar dardy'), though a phrase may end in an inflection
+        ('chest pains'), which its span takes in. Overlaps resolve leftmost-longest:
+        'severe headache' wins over the 'headache' inside it.
+        """
+        single_token = self._single_token
+        hits = []
+        words = []
+        for m in _TOKEN_RE.finditer(text):
+            word = m.group()
+            words.append(word)
+            if word in single_token:
+                hits.append((m.start(), m.end(), single_token[word]))
+        
+        if self._phrase_starts is not None and self._phrase_starts.isdisjoint(words):
+            pass  # No phrase can start here: skip the phrase scan
+        elif self._hyperscan_db is not None and text.isascii():
+            phrase_ids = self._phrase_ids
+            
+            def on_match(expression, start, end, flags, context):
+                end = _word_end(text, start, end)
+                if end != -1:
+                    hits.append((start, end, phrase_ids[expression]))
             
-            for variation in variations:
-                self._variation_to_canonical[variation.lower()] = canonical
+            try:
+                self._hyperscan_db.scan(text.encode(), match_event_handler=on_match)
+            except hyperscan.ScratchInUseError:
+                # Another thread is mid-scan on the shared scratch space
+                self._hyperscan_db.scan(
+                    text.encode(), match_event_handler=on_match,
+                    scratch=hyperscan.Scratch(database=self._hyperscan_db)
+                )
+        elif self._automaton is not None:
+            for end, (length, canonical) in self._automaton.iter(text):
+                start = end + 1 - length
+                end = _word_end(text, start, end + 1)
+                if end != -1:
+                    hits.append((start, end, canonical))
+        else:
+            lookup = self._variation_to_id
+            hits.extend((m.start(), m.end(), lookup[m.group(1)]) for m in self._pattern.finditer(text))
+        
+        # Leftmost first, longest first at the same start; drop overlaps
+        hits.sort(key=lambda h: (h[0], h[0] - h[1]))
+        spans = []
+        last_end = 0
+        for start, end, canonical in hits:
+            if start >= last_end:
+                spans.append((start, end, canonical))
+                last_end = end
+        return spans, words
     
     def normalize(self, text: str) -> Tuple[str, List[str]]:
         """
@@ -748,69 +1228,145 @@ class SymptomNormalizer:
         Returns:
             Tuple of (normalized_text, list_of_symptoms_found)
         """
-        text_lower = text.lower().strip()
-        found_symptoms = []
-        normalized_text = text_lower
-        
-        # First pass: Direct lookup for known variations
-        for variation, canonical in sorted(self._variation_to_canonical.items(), key=lambda x: -len(x[0])):
-            if variation in normalized_text:
-                if canonical not in found_symptoms:
-                    found_symptoms.append(canonical)
-                # Normalize the text
-                normalized_text = normalized_text.replace(variation, canonical)
-        
-        # Second pass: Fuzzy matching for unknown typos
-        words = text_lower.split()
-        for i, word in enumerate(words):
-            if len(word) >= 4 and word not in self._variation_to_canonical:
-                # Try fuzzy match
-                match = self._fuzzy_match(word)
-                if match:
-                    if match not in found_symptoms:
-                        found_symptoms.append(match)
+        normalized_text, found_symptoms = self._normalize_cached(_match_form(text))
+        return normalized_text, list(found_symptoms)
+    
+    def _normalize_folded(self, text_lower: str) -> Tuple[str, Tuple[str, ...]]:
+        """
+        normalize() on already folded, lowercased and stripped text.
+        Returns a tuple of symptoms so cached results can't be mutated.
+        """
+        names = self._canonical_names
+        # Insertion-ordered set: O(1) dedup, output stays in order of discovery
+        found_ids: Dict[int, None] = {}
+        
+        # First pass: Direct lookup for known variations, each matched span
+        # replaced by its canonical form
+        spans, words = self._find_variations(text_lower)
+        pieces = []
+        pos = 0
+        for start, end, cid in spans:
+            found_ids[cid] = None
+            pieces.append(text_lower[pos:start])
+            pieces.append(names[cid])
+            pos = end
+        pieces.append(text_lower[pos:])
+        normalized_text = ''.join(pieces)
+        
+        # Second pass: Fuzzy matching for unknown typos, over the tokens the
+        # first pass already split out
+        unknowns = list(dict.fromkeys(
+            word for word in words
+            if len(word) >= 4 and word not in self._variation_to_id and word not in _STOPWORDS
+        ))
+        for cid in self._fuzzy_match_many(unknowns):
+            if cid is not None:
+                found_ids[cid] = None
         
         # Check for multi-word symptoms that might have been missed
-        for canonical in self.CANONICAL_SYMPTOMS:
-            if canonical in normalized_text and canonical not in found_symptoms:
-                found_symptoms.append(canonical)
+        if self._canonical_automaton is not None:
+            # Every canonical name occurring in the text as whole words, from
+            # one native scan; listed ids follow CANONICAL_SYMPTOMS order, so
+            # sorting them gives the same order as the loop below
+            present = {
+                cid for end, cid in self._canonical_automaton.iter(normalized_text)
+                if _at_word_boundaries(normalized_text, end + 1 - len(names[cid]), end + 1)
+            }
+            present.difference_update(found_ids)
+            found_ids.update(dict.fromkeys(sorted(present)))
+        elif self._canonical_pattern is not None:
+            present = {self._canonical_ids[m.group(1)] for m in self._canonical_pattern.finditer(normalized_text)}
+            present.difference_update(found_ids)
+            found_ids.update(dict.fromkeys(sorted(present)))
+        else:
+            for cid in range(self._listed_count):
+                if cid not in found_ids and _contains_words(normalized_text, names[cid]):
+                    found_ids[cid] = None
         
-        return normalized_text, found_symptoms
+        return normalized_text, tuple(names[cid] for cid in found_ids)
     
-    def _fuzzy_match(self, word: str, threshold: float = 0.8) -> Optional[str]:
+    def _fuzzy_match_many(self, words: List[str], threshold: float = 0.8) -> List[Optional[int]]:
         """
-        Fuzzy match a word against known symptoms.
-        Uses sequence matching for typo detection.
+        _fuzzy_match() for several words at once, with results cached per
+        word so only words not seen recently are scored.
         """
-        best_match = None
-        best_ratio = threshold
-        
-        # Check against canonical symptoms
-        for symptom in self._canonical_set:
-            # Only compare single words or first word of multi-word symptoms
-            symptom_words = symptom.split()
-            for sym_word in symptom_words:
-                ratio = SequenceMatcher(None, word, sym_word).ratio()
-                if ratio > best_ratio:
-                    best_ratio = ratio
-                    best_match = symptom
-        
-        # Check against known variations
-        for variation in list(self._variation_to_canonical.keys())[:500]:  # Limit for performance
-            if len(variation.split()) == 1:  # Single word variations only
-                ratio = SequenceMatcher(None, word, variation).ratio()
-                if ratio > best_ratio:
-                    best_ratio = ratio
-                    best_match = self._variation_to_canonical[variation]
-        
-        return best_match
+        results: Dict[str, Optional[int]] = {}
+        misses = []
+        for word in words:
+            key = (word, threshold)
+            cached = self._fuzzy_cache.get(key, _NOT_CACHED)
+            if cached is _NOT_CACHED:
+                misses.append(word)
+            else:
+                self._fuzzy_cache.move_to_end(key)
+                results[word] = cached
+        
+        for word, cid in zip(misses, self._score_words(misses, threshold)):
+            results[word] = cid
+            self._fuzzy_cache[(word, threshold)] = cid
+            if len(self._fuzzy_cache) > FUZZY_CACHE_SIZE:
+                self._fuzzy_cache.popitem(last=False)
+        
+        return [results[word] for word in words]
+    
+    def _score_words(self, words: List[str], threshold: float) -> List[Optional[int]]:
+        """
+        Uncached _fuzzy_match() for several words. With rapidfuzz, scores
+        every word against every candidate in a single cdist call.
+        """
+        if len(words) < 2 or not (HAS_RAPIDFUZZ and HAS_NUMPY):
+            return [self._fuzzy_match(word, threshold) for word in words]
+        
+        cutoff = threshold * 100
+        # float64 so scores compare exactly like extractOne's; single-threaded
+        # because the matrix is far too small to pay for a thread pool
+        scores = process.cdist(words, self._fuzzy_words, scorer=fuzz.ratio, score_cutoff=cutoff, dtype=np.float64)
+        best = scores.argmax(axis=1)  # First maximum, so ties go to the earliest candidate
+        best_scores = scores[np.arange(len(words)), best]
+        return [
+            self._fuzzy_ids[index] if score > cutoff else None
+            for index, score in zip(best.tolist(), best_scores.tolist())
+        ]
+    
+    def _fuzzy_match(self, word: str, threshold: float = 0.8) -> Optional[int]:
+        """
+        Fuzzy match a word against known symptoms, returning a canonical id.
+        Scores are normalized Indel similarity (rapidfuzz's fuzz.ratio).
+        """
+        cutoff = threshold * 100
+        if HAS_RAPIDFUZZ:
+            # Best candidate in one C++ call (ties go to the earliest candidate)
+            result = process.extractOne(word, self._fuzzy_words, scorer=fuzz.ratio, score_cutoff=cutoff)
+            if result is None or result[1] <= cutoff:  # Strictly better than threshold
+                return None
+            return self._fuzzy_ids[result[2]]
+        
+        # A score above the threshold needs distance < (1 - t) * (len(a) + len(b)),
+        # and len(b) <= len(a) + distance, so the distance is below
+        # 2 * (1 - t) * len(a) / t: only that radius of the tree is searched
+        word_len = len(word)
+        radius = int(2 * (1 - threshold) * word_len / threshold)
+        masks = _char_masks(word)  # Shared by every comparison below
+        best = None
+        for length, tree in self._fuzzy_trees.items():
+            # The score can't exceed 2 * min(len) / total, so this whole
+            # length is out of reach
+            if 2 * min(word_len, length) <= threshold * (word_len + length):
+                continue
+            for distance, index in tree.find(word, radius, masks):
+                score = (1 - distance / (word_len + length)) * 100
+                if score > cutoff and (best is None or (-score, index) < best):
+                    best = (-score, index)
+        
+        return self._fuzzy_ids[best[1]] if best else None
     
-    def extract_symptoms(self, text: str) -> List[str]:
+    def extract_symptoms(self, text: str) -> Tuple[str, ...]:
         """
         Extract all symptoms from text.
-        Returns list of canonical symptom names.
+        Returns a tuple of canonical symptom names (shared with the cache,
+        so no copy is made per call).
         """
-        _, symptoms = self.normalize(text)
+        _, symptoms = self._normalize_cached(_match_form(text))
         return symptoms
     
     def get_canonical(self, symptom: str) -> str:
@@ -818,7 +1374,8 @@ class SymptomNormalizer:
         Get the canonical form of a symptom.
         Returns the input if no canonical form is found.
         """
-        return self._variation_to_canonical.get(symptom.lower(), symptom)
+        cid = self._variation_to_id.get(_match_form(symptom))
+        return symptom if cid is None else self._canonical_names[cid]
 
 
 # Global instance
@@ -826,7 +1383,7 @@ symptom_normalizer = SymptomNormalizer()
 
 
 # Convenience functions
-def normalize_symptoms(text: str) -> List[str]:
+def normalize_symptoms(text: str) -> Tuple[str, ...]:
     """Extract and normalize symptoms from text"""
     return symptom_normalizer.extract_symptoms(text)
 
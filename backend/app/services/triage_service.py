@@ -6,12 +6,44 @@ Smart Triage & Mental Health Detection Service
 - Crisis intervention
 """
 from __future__ import annotations
-import logging
 import re
-from typing import Dict, List, Any, Tuple
-from datetime import datetime
+from functools import lru_cache
+from types import MappingProxyType
+from typing import AbstractSet, Dict, Iterable, List, Any, Mapping, NamedTuple, Optional, Tuple
 
-logger = logging.getLogger(__name__)
+# Aho-Corasick automaton for the rule-phrase scan (optional, falls back to a regex)
+try:
+    import ahocorasick
+    HAS_AHOCORASICK = True
+except ImportError:
+    HAS_AHOCORASICK = False
+
+# Analyses remembered for repeated messages (retries, UI refreshes, the
+# same suggestion tapped twice)
+ANALYSIS_CACHE_SIZE = 4096
+
+# A blood pressure reading, "systolic/diastolic" ("120/80", " 150 / 95 ")
+_BP_RE = re.compile(r"\s*(\d+)\s*/\s*(\d+)\s*$")
+
+# Hyphens, dashes and slashes join words; read as spaces, "chest-pain"
+# matches "chest pain". Sentence punctuation stays: it already ends a word,
+# and "my chest. Pain in my knee" must not read as "chest pain".
+_JOINER_RE = re.compile(r"[-/\u2010-\u2015]+")
+
+# Curly apostrophes as typed on phones, so "can\u2019t" matches "can't"
+_QUOTES = str.maketrans("\u2018\u2019", "''")
+
+# Word characters, as the regex \b sees them
+_WORD_CHAR_RE = re.compile(r"\w")
+
+# Inflections a phrase may carry at its end and still match as a word, so
+# "chest pains" matches "chest pain" and "tumors" matches "tumor". "es" only
+# follows s/x/z/ch/sh/o ("hives" is not "hiv" + "es"), "d" only a final "e"
+_WORD_END_RE = re.compile(r"(?:s|ed|ing)?(?!\w)")
+_WORD_END_SIBILANT_RE = re.compile(r"(?:es|ed|ing)?(?!\w)")
+_WORD_END_O_RE = re.compile(r"(?:s|es|ed|ing)?(?!\w)")
+_WORD_END_E_RE = re.compile(r"(?:s|d)?(?!\w)")
+_WORD_END_PLAIN_RE = re.compile(r"(?!\w)")
 
 # Triage classification levels
 TRIAGE_LEVELS = {
@@ -52,6 +84,19 @@ TRIAGE_LEVELS = {
     }
 }
 
+# Each level's fields with its name, the common head of every triage result
+_LEVEL_BASE = {level: {"level": level, **meta} for level, meta in TRIAGE_LEVELS.items()}
+
+# The default outcome has nothing message-specific, so one shared copy serves
+_SELF_CARE_RESULT = MappingProxyType({
+    **_LEVEL_BASE["self_care"],
+    "reason": "Symptoms appear manageable with home care and monitoring",
+    "no_otc": False
+})
+
+# Levels that need attention within hours
+_HIGH_PRIORITY_LEVELS = frozenset({"emergency", "urgent"})
+
 # Emergency symptom patterns
 EMERGENCY_PATTERNS = [
     {
@@ -112,6 +157,9 @@ EMERGENCY_PATTERNS = [
     }
 ]
 
+# Emergencies declared on their main pattern alone, without a co-symptom
+_CRITICAL_CONDITIONS = frozenset({"Mental Health Crisis", "Possible Heart Attack", "Respiratory Emergency"})
+
 # Urgent (non-emergency) patterns
 URGENT_PATTERNS = [
     {
@@ -207,6 +255,20 @@ SERIOUS_CONDITIONS = [
     }
 ]
 
+# Reasons to see a doctor when nothing more specific matched
+DOCTOR_INDICATORS = [
+    ("persistent", "Persistent symptoms need professional evaluation"),
+    ("getting worse", "Worsening symptoms should be evaluated"),
+    ("not improving", "Symptoms not improving may need treatment"),
+    ("several days", "Prolonged symptoms warrant medical attention"),
+    ("recurring", "Recurring symptoms should be investigated"),
+    ("unusual", "Unusual symptoms deserve professional assessment"),
+    ("never had before", "New symptoms should be evaluated by a doctor"),
+    ("concerned", "When you're concerned, it's best to see a doctor"),
+    # No entries for 'pregnant', 'diabetes' or 'heart condition': those are
+    # SERIOUS_CONDITIONS patterns, which are checked first and always win
+]
+
 # Mental health indicators
 MENTAL_HEALTH_INDICATORS = {
     "depression": {
@@ -269,6 +331,18 @@ MENTAL_HEALTH_INDICATORS = {
     }
 }
 
+# Analysis of a message with no mental health content, shared by all of them
+_NO_MENTAL_HEALTH_RESULT = MappingProxyType({
+    "has_mental_health_content": False,
+    "categories": (),
+    "severity": "low",
+    "is_crisis": False,
+    "supportive_response": None,
+    "resources": (),
+    "follow_up_questions": (),
+    "grounding_exercise": None
+})
+
 # Supportive responses for mental health
 SUPPORTIVE_RESPONSES = {
     "depression": {
@@ -317,6 +391,96 @@ SUPPORTIVE_RESPONSES = {
 }
 
 
+def _normalize_message(text: str) -> str:
+    """Lowercase, joiners to spaces, whitespace runs collapsed"""
+    return " ".join(_JOINER_RE.sub(" ", text.lower().translate(_QUOTES)).split())
+
+
+def _at_word_boundaries(text: str, start: int, end: int) -> bool:
+    """
+    Whether text[start:end] starts at a word boundary and ends at one, maybe
+    after an inflection: 'tumor' in 'tumors', but not 'hiv' in 'shivering'
+    or 'mass' in 'massage'
+    """
+    if start > 0 and _WORD_CHAR_RE.match(text, start - 1):
+        return False
+    if not _WORD_CHAR_RE.match(text, end - 1):
+        word_end = _WORD_END_PLAIN_RE
+    elif text.endswith(("s", "x", "z", "ch", "sh"), start, end):
+        word_end = _WORD_END_SIBILANT_RE
+    elif text.endswith("o", start, end):
+        word_end = _WORD_END_O_RE
+    elif text.endswith("e", start, end):
+        word_end = _WORD_END_E_RE
+    else:
+        word_end = _WORD_END_RE
+    return word_end.match(text, end) is not None
+
+
+class _ScanHits(NamedTuple):
+    """The phrases found in a message"""
+    anywhere: AbstractSet[str]     # Like `phrase in message`
+    words: AbstractSet[str]        # At word boundaries, inflections allowed ('tumors', not 'shivering' for 'hiv')
+
+
+class _PhraseScanner:
+    """
+    Finds which of a fixed set of phrases occur in a message in a single
+    pass, instead of one substring search per phrase. Reports both the
+    phrases found anywhere and those found as (possibly inflected) words,
+    so rules of either kind share the pass. Phrases are matched in their
+    _normalize_message() form ('post-op' as 'post op') against a
+    normalized message, and reported as given.
+    """
+    
+    def __init__(self, phrases: Iterable[str]):
+        self.phrases = frozenset(phrases)
+        self._originals: Dict[str, Tuple[str, ...]] = {}
+        for phrase in sorted(self.phrases):
+            normalized = _normalize_message(phrase)
+            self._originals[normalized] = self._originals.get(normalized, ()) + (phrase,)
+        
+        self._automaton = None
+        self._pattern = None
+        if HAS_AHOCORASICK:
+            # The automaton reports every occurrence, overlapping ones included
+            self._automaton = ahocorasick.Automaton()
+            for normalized in self._originals:
+                self._automaton.add_word(normalized, normalized)
+            self._automaton.make_automaton()
+        else:
+            # A zero-width lookahead is tried at every position, so matches
+            # may overlap; longest first, each position reports the longest
+            # phrase starting there
+            ordered = sorted(self._originals, key=lambda p: (-len(p), p))
+            self._pattern = re.compile("(?=(" + "|".join(map(re.escape, ordered)) + "))")
+            # ...and the shorter phrases starting there are its prefixes
+            self._prefixes = {
+                phrase: tuple(p for p in self._originals if len(p) < len(phrase) and phrase.startswith(p))
+                for phrase in self._originals
+            }
+    
+    def scan(self, message: str) -> _ScanHits:
+        """The phrases found in a _normalize_message()d message"""
+        anywhere = set()
+        words = set()
+        originals = self._originals
+        if self._automaton is not None:
+            for end, phrase in self._automaton.iter(message):
+                anywhere.update(originals[phrase])
+                if _at_word_boundaries(message, end + 1 - len(phrase), end + 1):
+                    words.update(originals[phrase])
+        else:
+            for m in self._pattern.finditer(message):
+                start = m.start()
+                phrase = m.group(1)
+                for p in (phrase, *self._prefixes[phrase]):
+                    anywhere.update(originals[p])
+                    if _at_word_boundaries(message, start, start + len(p)):
+                        words.update(originals[p])
+        return _ScanHits(anywhere, words)
+
+
 class TriageService:
     """Smart triage system for medical urgency classification"""
     
@@ -324,20 +488,36 @@ class TriageService:
         self.emergency_patterns = EMERGENCY_PATTERNS
         self.urgent_patterns = URGENT_PATTERNS
         self.serious_conditions = SERIOUS_CONDITIONS
+        self.doctor_indicators = DOCTOR_INDICATORS
         self.triage_levels = TRIAGE_LEVELS
+        
+        # Every phrase the checks below look for, scanned for once per message
+        phrases = [indicator for indicator, _ in self.doctor_indicators]
+        for pattern in self.emergency_patterns:
+            phrases += pattern["patterns"] + pattern.get("co_symptoms", [])
+        for pattern in self.urgent_patterns + self.serious_conditions:
+            phrases += pattern["patterns"]
+        self._phrases = frozenset(phrases)
+        self._scanner = _PhraseScanner(self._phrases)
     
-    def analyze(self, message: str, vitals: Dict = None) -> Dict[str, Any]:
+    def analyze(self, message: str, vitals: Dict = None) -> Mapping[str, Any]:
         """
         Analyze message and vitals to determine triage level
         """
-        message_lower = message.lower()
+        return self._analyze_normalized(_normalize_message(message), vitals)
+    
+    def _analyze_normalized(self, message_norm: str, vitals: Dict = None, hits: Optional[_ScanHits] = None) -> Mapping[str, Any]:
+        """analyze() for an already normalized message, maybe already scanned"""
+        if hits is None:
+            hits = self._scanner.scan(message_norm)
+        # Triage phrases match as words (plurals and -ed/-ing forms included)
+        found = hits.words
         
         # Check for emergency patterns first
-        emergency_match = self._check_emergency(message_lower)
+        emergency_match = self._check_emergency(found)
         if emergency_match:
             return {
-                "level": "emergency",
-                **self.triage_levels["emergency"],
+                **_LEVEL_BASE["emergency"],
                 "detected_condition": emergency_match["condition"],
                 "reason": emergency_match["reason"],
                 "specific_action": emergency_match["action"],
@@ -346,12 +526,11 @@ class TriageService:
             }
         
         # Check for serious medical conditions (tumors, cancer, diabetes, etc.)
-        serious_match = self._check_serious_conditions(message_lower)
+        serious_match = self._check_serious_conditions(found)
         if serious_match:
             level = serious_match.get("level", "doctor_soon")
             return {
-                "level": level,
-                **self.triage_levels[level],
+                **_LEVEL_BASE[level],
                 "detected_condition": serious_match["condition"],
                 "reason": serious_match["reason"],
                 "specific_action": serious_match.get("action", "Please consult a specialist"),
@@ -360,11 +539,10 @@ class TriageService:
             }
         
         # Check for urgent patterns
-        urgent_match = self._check_urgent(message_lower)
+        urgent_match = self._check_urgent(found)
         if urgent_match:
             return {
-                "level": "urgent",
-                **self.triage_levels["urgent"],
+                **_LEVEL_BASE["urgent"],
                 "detected_condition": urgent_match["condition"],
                 "reason": urgent_match["reason"],
                 "specific_timeframe": urgent_match.get("timeframe", "Within 2-4 hours"),
@@ -378,52 +556,47 @@ class TriageService:
                 return vitals_triage
         
         # Check for doctor-needed patterns
-        doctor_needed = self._check_doctor_needed(message_lower)
+        doctor_needed = self._check_doctor_needed(found)
         if doctor_needed:
             return {
-                "level": "doctor_soon",
-                **self.triage_levels["doctor_soon"],
+                **_LEVEL_BASE["doctor_soon"],
                 "reason": doctor_needed,
                 "no_otc": False
             }
         
         # Default to self-care
-        return {
-            "level": "self_care",
-            **self.triage_levels["self_care"],
-            "reason": "Symptoms appear manageable with home care and monitoring",
-            "no_otc": False
-        }
+        return _SELF_CARE_RESULT
     
-    def _check_serious_conditions(self, message: str) -> Dict | None:
+    def _check_serious_conditions(self, found: AbstractSet[str]) -> Dict | None:
         """Check for serious medical conditions that need specialist care"""
         for condition in self.serious_conditions:
-            if any(p in message for p in condition["patterns"]):
+            if any(p in found for p in condition["patterns"]):
                 return condition
         return None
     
-    def _check_emergency(self, message: str) -> Dict | None:
+    def _check_emergency(self, found: AbstractSet[str]) -> Dict | None:
         """Check for emergency patterns"""
         for pattern in self.emergency_patterns:
             # Check main patterns
-            main_match = any(p in message for p in pattern["patterns"])
+            main_match = any(p in found for p in pattern["patterns"])
             if main_match:
                 # Check for co-symptoms (increases confidence)
-                co_symptoms_found = [s for s in pattern.get("co_symptoms", []) if s in message]
+                co_symptoms = pattern.get("co_symptoms", [])
                 
                 # If main pattern matches AND has co-symptoms, definitely emergency
                 # If only main pattern for critical conditions, still emergency
-                if co_symptoms_found or pattern["condition"] in ["Mental Health Crisis", "Possible Heart Attack", "Respiratory Emergency"]:
+                # (the list of co-symptoms is only built for a match)
+                if any(s in found for s in co_symptoms) or pattern["condition"] in _CRITICAL_CONDITIONS:
                     return {
                         **pattern,
-                        "co_symptoms_found": co_symptoms_found
+                        "co_symptoms_found": [s for s in co_symptoms if s in found]
                     }
         return None
     
-    def _check_urgent(self, message: str) -> Dict | None:
+    def _check_urgent(self, found: AbstractSet[str]) -> Dict | None:
         """Check for urgent (non-emergency) patterns"""
         for pattern in self.urgent_patterns:
-            if any(p in message for p in pattern["patterns"]):
+            if any(p in found for p in pattern["patterns"]):
                 return pattern
         return None
     
@@ -442,8 +615,7 @@ class TriageService:
         if spo2:
             if spo2 < 92:
                 return {
-                    "level": "emergency",
-                    **self.triage_levels["emergency"],
+                    **_LEVEL_BASE["emergency"],
                     "detected_condition": "Low Blood Oxygen",
                     "reason": f"SpO2 of {spo2}% is dangerously low (normal: 95-100%)",
                     "specific_action": "Seek immediate medical attention. Low oxygen can be life-threatening."
@@ -457,8 +629,7 @@ class TriageService:
             temp_f = float(temp) if isinstance(temp, (int, float, str)) else 98.6
             if temp_f > 103:
                 return {
-                    "level": "urgent",
-                    **self.triage_levels["urgent"],
+                    **_LEVEL_BASE["urgent"],
                     "detected_condition": "High Fever",
                     "reason": f"Temperature {temp_f}°F requires prompt medical evaluation"
                 }
@@ -467,48 +638,30 @@ class TriageService:
         
         # Blood pressure (if available)
         bp = vitals.get("bp") or vitals.get("bloodPressure")
-        if bp and "/" in str(bp):
-            try:
-                systolic, diastolic = map(int, str(bp).split("/"))
-                if systolic > 180 or diastolic > 120:
-                    return {
-                        "level": "urgent",
-                        **self.triage_levels["urgent"],
-                        "detected_condition": "Hypertensive Crisis",
-                        "reason": f"Blood pressure {bp} mmHg is critically high"
-                    }
-                elif systolic > 140 or diastolic > 90:
-                    concerns.append(f"Elevated blood pressure: {bp}")
-            except:
-                pass
+        bp_match = _BP_RE.match(str(bp)) if bp else None
+        if bp_match:
+            systolic, diastolic = int(bp_match.group(1)), int(bp_match.group(2))
+            if systolic > 180 or diastolic > 120:
+                return {
+                    **_LEVEL_BASE["urgent"],
+                    "detected_condition": "Hypertensive Crisis",
+                    "reason": f"Blood pressure {bp} mmHg is critically high"
+                }
+            elif systolic > 140 or diastolic > 90:
+                concerns.append(f"Elevated blood pressure: {bp}")
         
         if concerns:
             return {
-                "level": "doctor_soon",
-                **self.triage_levels["doctor_soon"],
+                **_LEVEL_BASE["doctor_soon"],
                 "reason": "; ".join(concerns)
             }
         
         return None
     
-    def _check_doctor_needed(self, message: str) -> str | None:
+    def _check_doctor_needed(self, found: AbstractSet[str]) -> str | None:
         """Check if symptoms warrant doctor visit"""
-        doctor_indicators = [
-            ("persistent", "Persistent symptoms need professional evaluation"),
-            ("getting worse", "Worsening symptoms should be evaluated"),
-            ("not improving", "Symptoms not improving may need treatment"),
-            ("several days", "Prolonged symptoms warrant medical attention"),
-            ("recurring", "Recurring symptoms should be investigated"),
-            ("unusual", "Unusual symptoms deserve professional assessment"),
-            ("never had before", "New symptoms should be evaluated by a doctor"),
-            ("concerned", "When you're concerned, it's best to see a doctor"),
-            ("pregnant", "Symptoms during pregnancy need medical attention"),
-            ("diabetes", "Diabetic patients should consult doctor for new symptoms"),
-            ("heart condition", "Those with heart conditions need prompt evaluation"),
-        ]
-        
-        for indicator, reason in doctor_indicators:
-            if indicator in message:
+        for indicator, reason in self.doctor_indicators:
+            if indicator in found:
                 return reason
         
         return None
@@ -520,26 +673,48 @@ class MentalHealthService:
     def __init__(self):
         self.indicators = MENTAL_HEALTH_INDICATORS
         self.responses = SUPPORTIVE_RESPONSES
+        
+        # Each keyword and escalator with the categories it belongs to, so
+        # one scan of the message finds the hits of every category. These
+        # match anywhere, inflections included ('constant' in 'constantly').
+        self._phrase_roles: Dict[str, List[Tuple[str, bool]]] = {}
+        for category, data in self.indicators.items():
+            if category == "crisis":
+                continue
+            for keyword in data["keywords"]:
+                self._phrase_roles.setdefault(keyword, []).append((category, False))
+            for escalator in data.get("severity_escalators", []):
+                self._phrase_roles.setdefault(escalator, []).append((category, True))
+        
+        # Crisis phrases come out of the same scan
+        crisis_data = self.indicators.get("crisis", {})
+        self._crisis_keywords = frozenset(crisis_data.get("keywords", []))
+        self._crisis_escalators = frozenset(crisis_data.get("severity_escalators", []))
+        
+        self._phrases = frozenset(self._phrase_roles) | self._crisis_keywords | self._crisis_escalators
+        self._scanner = _PhraseScanner(self._phrases)
+        
+        # Responses only depend on the category and severity: render each once
+        self._crisis_response = self._render_crisis_response()
+        self._supportive_responses = {
+            (category, severity): self._render_supportive_response(category, severity)
+            for category in [*self.indicators, *self.responses]
+            for severity in ("low", "moderate", "high")
+        }
     
-    def analyze(self, message: str) -> Dict[str, Any]:
+    def analyze(self, message: str) -> Mapping[str, Any]:
         """
         Analyze message for mental health indicators
         """
-        message_lower = message.lower()
-        
-        detected = {
-            "has_mental_health_content": False,
-            "categories": [],
-            "severity": "low",
-            "is_crisis": False,
-            "supportive_response": None,
-            "resources": [],
-            "follow_up_questions": [],
-            "grounding_exercise": None
-        }
+        return self._analyze_normalized(_normalize_message(message))
+    
+    def _analyze_normalized(self, message_norm: str, hits: Optional[_ScanHits] = None) -> Mapping[str, Any]:
+        """analyze() for an already normalized message, maybe already scanned"""
+        if hits is None:
+            hits = self._scanner.scan(message_norm)
         
         # Check for crisis first (highest priority)
-        crisis_check = self._check_crisis(message_lower)
+        crisis_check = self._check_crisis(hits)
         if crisis_check["is_crisis"]:
             return {
                 "has_mental_health_content": True,
@@ -552,56 +727,71 @@ class MentalHealthService:
             }
         
         # Check other mental health categories
-        for category, data in self.indicators.items():
-            if category == "crisis":
-                continue
-                
-            keyword_matches = [kw for kw in data["keywords"] if kw in message_lower]
-            if keyword_matches:
-                detected["has_mental_health_content"] = True
-                detected["categories"].append(category)
+        keyword_counts: Dict[str, int] = {}
+        escalated = set()
+        for phrase in hits.anywhere & self._phrase_roles.keys():
+            for category, is_escalator in self._phrase_roles[phrase]:
+                if is_escalator:
+                    escalated.add(category)
+                else:
+                    keyword_counts[category] = keyword_counts.get(category, 0) + 1
+        
+        categories = []
+        severity = "low"
+        for category in self.indicators:
+            if category in keyword_counts:
+                categories.append(category)
                 
                 # Check severity escalators
-                severity_matches = [s for s in data.get("severity_escalators", []) if s in message_lower]
-                if severity_matches:
-                    detected["severity"] = "high"
-                elif len(keyword_matches) >= 2:
-                    detected["severity"] = "moderate"
+                if category in escalated:
+                    severity = "high"
+                elif keyword_counts[category] >= 2:
+                    severity = "moderate"
                 else:
-                    detected["severity"] = "low"
+                    severity = "low"
         
-        # Build supportive response if mental health content detected
-        if detected["has_mental_health_content"]:
-            primary_category = detected["categories"][0] if detected["categories"] else "general"
-            detected["supportive_response"] = self._build_supportive_response(
-                primary_category, 
-                detected["severity"]
-            )
-            detected["resources"] = self._get_resources(primary_category)
-            detected["follow_up_questions"] = self._get_follow_up_questions(primary_category)
-            
-            if primary_category == "anxiety":
-                detected["grounding_exercise"] = self.responses["anxiety"].get("grounding_exercise")
-                detected["breathing_exercise"] = self.responses["anxiety"].get("breathing_exercise")
+        if not categories:
+            return _NO_MENTAL_HEALTH_RESULT
+        
+        # Build supportive response for the primary category
+        primary_category = categories[0]
+        detected = {
+            "has_mental_health_content": True,
+            "categories": categories,
+            "severity": severity,
+            "is_crisis": False,
+            "supportive_response": self._build_supportive_response(primary_category, severity),
+            "resources": self._get_resources(primary_category),
+            "follow_up_questions": self._get_follow_up_questions(primary_category),
+            "grounding_exercise": None
+        }
+        if primary_category == "anxiety":
+            detected["grounding_exercise"] = self.responses["anxiety"].get("grounding_exercise")
+            detected["breathing_exercise"] = self.responses["anxiety"].get("breathing_exercise")
         
         return detected
     
-    def _check_crisis(self, message: str) -> Dict:
+    def _check_crisis(self, hits: _ScanHits) -> Dict:
         """Check for crisis/suicidal content"""
-        crisis_data = self.indicators.get("crisis", {})
-        
-        for keyword in crisis_data.get("keywords", []):
-            if keyword in message:
-                # Check severity escalators
-                for escalator in crisis_data.get("severity_escalators", []):
-                    if escalator in message:
-                        return {"is_crisis": True, "severity": "immediate"}
-                return {"is_crisis": True, "severity": "high"}
-        
-        return {"is_crisis": False}
+        if hits.anywhere.isdisjoint(self._crisis_keywords):
+            return {"is_crisis": False}
+        # Check severity escalators
+        if hits.anywhere.isdisjoint(self._crisis_escalators):
+            return {"is_crisis": True, "severity": "high"}
+        return {"is_crisis": True, "severity": "immediate"}
     
     def _build_crisis_response(self) -> str:
         """Build crisis intervention response"""
+        return self._crisis_response
+    
+    def _build_supportive_response(self, category: str, severity: str) -> str:
+        """Build supportive response based on category and severity"""
+        response = self._supportive_responses.get((category, severity))
+        if response is None:
+            response = self._render_supportive_response(category, severity)
+        return response
+    
+    def _render_crisis_response(self) -> str:
         crisis = self.responses["crisis"]
         return f"""{crisis['acknowledgment']}
 
@@ -614,8 +804,7 @@ class MentalHealthService:
 
 You matter. Please reach out right now. 💙"""
     
-    def _build_supportive_response(self, category: str, severity: str) -> str:
-        """Build supportive response based on category and severity"""
+    def _render_supportive_response(self, category: str, severity: str) -> str:
         data = self.responses.get(category, self.responses["general"])
         
         response_parts = [data["acknowledgment"]]
@@ -649,29 +838,76 @@ You matter. Please reach out right now. 💙"""
 triage_service = TriageService()
 mental_health_service = MentalHealthService()
 
+# Every phrase of both services, so analyze_message scans each message once
+_scanner = _PhraseScanner(triage_service._phrases | mental_health_service._phrases)
+
+
+def analyze_message(message: str, vitals: Dict = None) -> Mapping[str, Any]:
+    """
+    Comprehensive analysis combining triage and mental health.
+    Results are cached and shared between callers, so they are read-only.
+    """
+    try:
+        # The value's type is part of the key: 130 and 130.0 read differently in reasons
+        vitals_key = tuple(sorted((k, type(v), v) for k, v in vitals.items())) if vitals else ()
+        hash(vitals_key)
+    except TypeError:
+        # Nested or oddly keyed vitals: analyze without the cache
+        return _analyze(_normalize_message(message), vitals)
+    return _analyze_cached(_normalize_message(message), vitals_key)
+
+
+def clear_analysis_cache() -> None:
+    """Forget cached analyses (after changing the rule tables, in tests)"""
+    _analyze_cached.cache_clear()
+
 
-def analyze_message(message: str, vitals: Dict = None) -> Dict[str, Any]:
+@lru_cache(maxsize=ANALYSIS_CACHE_SIZE)
+def _analyze_cached(message_norm: str, vitals_key: Tuple) -> Mapping[str, Any]:
+    return _analyze(message_norm, {k: v for k, _, v in vitals_key})
+
+
+def analyze_batch(messages: List[str]) -> List[Mapping[str, Any]]:
     """
-    Comprehensive analysis combining triage and mental health
+    analyze_message() of each message (without vitals), for bulk work such
+    as re-classifying chat history. Bypasses the cache, so a large batch
+    doesn't evict the live chat's entries.
     """
+    return [_analyze(_normalize_message(message)) for message in messages]
+
+
+def _frozen(result: Mapping[str, Any]) -> Mapping[str, Any]:
+    """Read-only view of a result, with list values as tuples"""
+    if isinstance(result, MappingProxyType):
+        return result
+    # The lists may be the rule tables' own (resources, follow-up questions)
+    return MappingProxyType({
+        key: tuple(value) if isinstance(value, list) else value
+        for key, value in result.items()
+    })
+
+
+def _analyze(message_norm: str, vitals: Dict = None) -> Mapping[str, Any]:
+    hits = _scanner.scan(message_norm)
+    
     # Mental health analysis
-    mental_health = mental_health_service.analyze(message)
+    mental_health = mental_health_service._analyze_normalized(message_norm, hits)
     
     # Triage analysis
-    triage = triage_service.analyze(message, vitals)
+    triage = triage_service._analyze_normalized(message_norm, vitals, hits)
     
     # If crisis detected, override triage to emergency
     if mental_health.get("is_crisis"):
         triage = {
-            "level": "emergency",
-            **TRIAGE_LEVELS["emergency"],
+            **_LEVEL_BASE["emergency"],
             "detected_condition": "Mental Health Crisis",
             "reason": "Immediate mental health support needed",
             "specific_action": "Please call a crisis helpline immediately"
         }
     
-    return {
-        "triage": triage,
-        "mental_health": mental_health,
-        "requires_immediate_attention": triage["level"] in ["emergency", "urgent"] or mental_health.get("is_crisis", False)
-    }
+    # Results are cached and shared, so nothing in them may be mutable
+    return MappingProxyType({
+        "triage": _frozen(triage),
+        "mental_health": _frozen(mental_health),
+        "requires_immediate_attention": triage["level"] in _HIGH_PRIORITY_LEVELS or mental_health.get("is_crisis", False)
+    })
@@ -2,17 +2,47 @@
 In-memory Database for Development
 """
 from typing import Optional
+from collections import namedtuple
 from datetime import datetime
-import uuid
+from operator import itemgetter
+from types import MappingProxyType
+import itertools
 import logging
+import random
+import threading
 
 logger = logging.getLogger(__name__)
 
+# Document ids only need to be unique within this process's store, so a
+# counter behind a random per-process prefix replaces uuid4 (no urandom
+# read per insert, and shorter strings)
+_id_prefix = f"{random.getrandbits(32):08x}"
+_id_counter = itertools.count(1)
+
+# Write results, shaped like pymongo's
+_InsertResult = namedtuple("_InsertResult", ["inserted_id"])
+_UpdateResult = namedtuple("_UpdateResult", ["matched_count", "modified_count"])
+
+
+def _sort_docs(docs: list, field: str, direction: int):
+    """Sort documents in place by field (missing values sort as 0)"""
+    reverse = direction == -1
+    try:
+        # itemgetter runs in C; list.sort computes every key before moving
+        # anything, so a KeyError leaves the list untouched for the fallback
+        docs.sort(key=itemgetter(field), reverse=reverse)
+    except KeyError:
+        docs.sort(key=lambda x: x.get(field, 0), reverse=reverse)
+
 
 class Database:
     """Database connection manager with in-memory storage"""
     
     _in_memory_store: dict = None
+    # Wrapper over the current store, built on first get_db and dropped
+    # whenever the store is replaced
+    _db_instance: "InMemoryDB" = None
+    _db_lock = threading.Lock()
     
     @classmethod
     async def connect_db(cls, database_url: str = None, db_name: str = None):
@@ -29,6 +59,7 @@ class Database:
             "messages": [],
             "vitals": []
         }
+        cls._db_instance = None
     
     @classmethod
     async def close_db(cls):
@@ -38,9 +69,15 @@ class Database:
     @classmethod
     def get_db(cls, db_name: str = None):
         """Get database wrapper"""
-        if cls._in_memory_store is None:
-            cls._init_in_memory()
-        return InMemoryDB(cls._in_memory_store)
+        instance = cls._db_instance
+        if instance is not None:
+            return instance
+        with cls._db_lock:
+            if cls._db_instance is None:
+                if cls._in_memory_store is None:
+                    cls._init_in_memory()
+                cls._db_instance = InMemoryDB(cls._in_memory_store)
+            return cls._db_instance
 
 
 class InMemoryDB:
@@ -63,61 +100,95 @@ class InMemoryCollection:
         
         if collection_name not in self.store:
             self.store[collection_name] = {} if key_field else []
+        self._data = self.store[collection_name]
+        
+        # Equality indexes over list-backed collections, {field: {value: [position, ...]}}
+        # (None for a field holding unhashable values). Built on the first query
+        # on a field and kept in the store, so every wrapper shares them.
+        # A dict-backed collection is its own index on key_field, unless
+        # marked None here.
+        self._indexes = self.store.setdefault("_indexes", {}).setdefault(collection_name, {})
     
-    async def find_one(self, query: dict, sort=None):
-        """Find single document matching query"""
-        data = self.store[self.collection_name]
+    async def find_one(self, query: dict, sort=None, mutable: bool = False):
+        """Find single document matching query
+        
+        Returns a read-only view of the stored document; pass mutable=True
+        to get a copy that can be edited. Both are shallow: nested lists and
+        dicts (a session's "messages") are the stored ones, so copy them
+        before changing them.
+        """
+        data = self._data
+        view = dict.copy if mutable else MappingProxyType
         
         if isinstance(data, dict):
-            for doc in data.values():
+            for doc in self._candidates(data, query):
                 if self._matches(doc, query):
-                    return doc.copy()
+                    return view(doc)
         else:
-            matches = [doc for doc in data if self._matches(doc, query)]
-            if sort:
-                field = sort[0][0] if isinstance(sort, list) else sort[0]
-                direction = sort[0][1] if isinstance(sort, list) else sort[1]
-                matches.sort(key=lambda x: x.get(field, 0), reverse=(direction == -1))
-            if matches:
-                return matches[0].copy()
+            matches = [doc for doc in self._candidates(data, query) if self._matches(doc, query)]
+            if not matches:
+                return None
+            if not sort:
+                return view(matches[0])
+            field = sort[0][0] if isinstance(sort, list) else sort[0]
+            direction = sort[0][1] if isinstance(sort, list) else sort[1]
+            # Only the first document of the sorted order is needed; min/max
+            # return the earliest of equal keys, as the stable sort did
+            pick = max if direction == -1 else min
+            try:
+                return view(pick(matches, key=itemgetter(field)))
+            except KeyError:
+                return view(pick(matches, key=lambda x: x.get(field, 0)))
         return None
     
     async def insert_one(self, doc: dict):
         """Insert single document"""
-        data = self.store[self.collection_name]
+        data = self._data
         doc = doc.copy()
-        doc["_id"] = str(uuid.uuid4())
+        doc["_id"] = f"{_id_prefix}{next(_id_counter):016x}"
         
         if isinstance(data, dict) and self.key_field:
             data[doc.get(self.key_field)] = doc
         elif isinstance(data, list):
             data.append(doc)
+            for field, index in self._indexes.items():
+                if index is not None:
+                    try:
+                        index.setdefault(doc.get(field), []).append(len(data) - 1)
+                    except TypeError:
+                        self._indexes[field] = None
         else:
-            self.store[self.collection_name] = [doc]
+            self._data = self.store[self.collection_name] = [doc]
+            self._indexes.clear()
         
-        class Result:
-            inserted_id = doc["_id"]
-        return Result()
+        return _InsertResult(doc["_id"])
     
     async def update_one(self, query: dict, update: dict):
         """Update single document"""
-        data = self.store[self.collection_name]
+        data = self._data
         
-        items = data.values() if isinstance(data, dict) else data
-        for doc in items:
+        for doc in self._candidates(data, query):
             if self._matches(doc, query):
                 self._apply_update(doc, update)
-                class Result:
-                    modified_count = 1
-                return Result()
+                
+                if isinstance(data, dict):
+                    # A document whose key field changed stays stored under its
+                    # old key, so lookups by key can no longer be trusted
+                    if self.key_field in update.get("$set", {}):
+                        self._indexes[self.key_field] = None
+                else:
+                    # Changed fields are re-indexed on their next query
+                    for op in update.values():
+                        for field in op:
+                            self._indexes.pop(field, None)
+                return _UpdateResult(1, 1)
         
-        class Result:
-            modified_count = 0
-        return Result()
+        return _UpdateResult(0, 0)
     
-    def find(self, query: dict):
-        """Find documents matching query"""
-        return InMemoryCursor(self.store[self.collection_name], query)
+    def find(self, query: dict, mutable: bool = False):
+        """Find documents matching query (read-only views unless mutable=True, shallow like find_one's)"""
+        data = self._data
+        return InMemoryCursor(self._candidates(data, query), query, mutable)
     
     async def create_index(self, *args, **kwargs):
         """No-op for in-memory storage"""
@@ -127,6 +198,49 @@ class InMemoryCollection:
         """Check if document matches query"""
         return all(doc.get(k) == v for k, v in query.items())
     
+    def _candidates(self, data, query: dict):
+        """
+        Documents that may match query, in storage order: the one stored
+        under the queried key, or those the most selective index lists.
+        Callers still check each with _matches.
+        """
+        if isinstance(data, dict):
+            if self.key_field in query and self._indexes.get(self.key_field, True) is not None:
+                try:
+                    doc = data.get(query[self.key_field])
+                except TypeError:  # Unhashable value
+                    return data.values()
+                return () if doc is None else (doc,)
+            return data.values()
+        
+        best = None
+        for field, value in query.items():
+            index = self._ensure_index(data, field)
+            if index is None:
+                continue
+            try:
+                positions = index.get(value, ())
+            except TypeError:
+                continue
+            if best is None or len(positions) < len(best):
+                best = positions
+        if best is None:
+            return data
+        return [data[i] for i in best]
+    
+    def _ensure_index(self, data: list, field: str):
+        """The equality index over field, built now if missing (None if unindexable)"""
+        if field in self._indexes:
+            return self._indexes[field]
+        index = {}
+        try:
+            for position, doc in enumerate(data):
+                index.setdefault(doc.get(field), []).append(position)
+        except TypeError:  # Unhashable values
+            index = None
+        self._indexes[field] = index
+        return index
+    
     def _apply_update(self, doc: dict, update: dict):
         """Apply update operations to document"""
         if "$set" in update:
@@ -144,9 +258,11 @@ class InMemoryCollection:
 class InMemoryCursor:
     """Cursor for in-memory find operations"""
     
-    def __init__(self, data, query: dict):
+    def __init__(self, data, query: dict, mutable: bool = False):
         items = data.values() if isinstance(data, dict) else data
-        self.data = [doc for doc in items if self._matches(doc, query)]
+        query_items = tuple(query.items())
+        self.data = [doc for doc in items if all(doc.get(k) == v for k, v in query_items)]
+        self._view = dict.copy if mutable else MappingProxyType
         self._sort_field = None
         self._sort_direction = 1
         self._limit = None
@@ -166,24 +282,31 @@ class InMemoryCursor:
         self._limit = n
         return self
     
-    def _matches(self, doc: dict, query: dict) -> bool:
-        """Check if document matches query"""
-        return all(doc.get(k) == v for k, v in query.items())
-    
-    def __aiter__(self):
-        """Async iterator"""
+    def _results(self) -> list:
+        """Matching documents, sorted and limited"""
         data = self.data.copy()
         if self._sort_field:
-            data.sort(key=lambda x: x.get(self._sort_field, 0), reverse=(self._sort_direction == -1))
+            _sort_docs(data, self._sort_field, self._sort_direction)
         if self._limit:
             data = data[:self._limit]
-        self._iter_data = iter(data)
+        return data
+    
+    async def to_list(self, length: Optional[int] = None) -> list:
+        """All results at once (at most length), like Motor's cursor.to_list"""
+        data = self._results()
+        if length is not None:
+            data = data[:length]
+        return [self._view(doc) for doc in data]
+    
+    def __aiter__(self):
+        """Async iterator"""
+        self._iter_data = iter(self._results())
         return self
     
     async def __anext__(self):
         """Get next item"""
         try:
-            return next(self._iter_data).copy()
+            return self._view(next(self._iter_data))
         except StopIteration:
             raise StopAsyncIteration
 
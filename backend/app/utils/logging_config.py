@@ -1,6 +1,70 @@
+import atexit
 import logging
+import queue
 import sys
-from pythonjsonlogger import jsonlogger
+from logging.handlers import QueueHandler, QueueListener
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+
+# Attributes every LogRecord carries; anything else came in through extra=
+_RESERVED_ATTRS = frozenset(
+    vars(logging.LogRecord("", 0, "", 0, "", (), None))
+) | {"message", "asctime"}
+
+
+# Background thread that writes queued records to stdout
+_queue_listener: QueueListener = None
+
+
+class _LocalQueueHandler(QueueHandler):
+    """Queue handler for a listener in the same process
+
+    The stdlib prepare() pre-formats the record and drops exc_info, folding
+    tracebacks into the message; here only the message is resolved so the
+    JSON formatter still sees the original fields.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+def _stop_queue_listener():
+    """Flush queued records and stop the listener thread"""
+    global _queue_listener
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        _queue_listener = None
+
+
+class OrjsonFormatter(logging.Formatter):
+    """JSON formatter with the same fields as the python-json-logger setup, serialized by orjson"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "asctime": self.formatTime(record, self.datefmt),
+            "name": record.name,
+            "levelname": record.levelname,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED_ATTRS:
+                entry[key] = value
+
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exc_info"] = record.exc_text
+        if record.stack_info:
+            entry["stack_info"] = self.formatStack(record.stack_info)
+
+        return orjson.dumps(entry, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
 
 
 def setup_logging(app_name: str, debug: bool = False):
@@ -19,14 +83,26 @@ def setup_logging(app_name: str, debug: bool = False):
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(log_level)
     
-    # JSON formatter for structured logging
-    formatter = jsonlogger.JsonFormatter(
-        fmt='%(asctime)s %(name)s %(levelname)s %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
+    # JSON formatter for structured logging (orjson when available)
+    if HAS_ORJSON:
+        formatter = OrjsonFormatter(datefmt='%Y-%m-%d %H:%M:%S')
+    else:
+        from pythonjsonlogger import jsonlogger
+        formatter = jsonlogger.JsonFormatter(
+            fmt='%(asctime)s %(name)s %(levelname)s %(message)s',
+            datefmt='%Y-%m-%d %H:%M:%S'
+        )
     console_handler.setFormatter(formatter)
     
-    logger.addHandler(console_handler)
+    # Log calls only enqueue the record; the listener thread formats it
+    # and does the stdout write off the request path
+    global _queue_listener
+    _stop_queue_listener()
+    log_queue = queue.SimpleQueue()
+    _queue_listener = QueueListener(log_queue, console_handler, respect_handler_level=True)
+    _queue_listener.start()
+    
+    logger.addHandler(_LocalQueueHandler(log_queue))
     
     # Reduce noise from verbose libraries
     logging.getLogger("uvicorn.access").setLevel(logging.WARNING)
@@ -35,3 +111,6 @@ def setup_logging(app_name: str, debug: bool = False):
     logger.info(f"{app_name} logging initialized", extra={"debug": debug})
     
     return logger
+
+
+atexit.register(_stop_queue_listener)
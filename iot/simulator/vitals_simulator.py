@@ -4,10 +4,17 @@ Simulates vitals sensors sending data via HTTP API
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 import random
 import time
 from datetime import datetime
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 
 class VitalsSimulator:
     """Simulate health vitals sensor"""
@@ -15,6 +22,14 @@ class VitalsSimulator:
     def __init__(self, api_url="http://localhost:8000", user_id="+919876543210"):
         self.api_url = api_url
         self.user_id = user_id
+        self._vitals_url = f"{api_url}/api/v1/vitals"
+        self._json_headers = {"Content-Type": "application/json"}
+        
+        # One pooled session so readings reuse the same connection
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=4)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
     
     def generate_normal_vitals(self):
         """Generate realistic vitals"""
@@ -48,10 +63,19 @@ class VitalsSimulator:
         }
         
         try:
-            response = requests.post(
-                f"{self.api_url}/api/v1/vitals",
-                json=payload
-            )
+            if HAS_ORJSON:
+                response = self._session.post(
+                    self._vitals_url,
+                    data=orjson.dumps(payload),
+                    headers=self._json_headers,
+                    timeout=10
+                )
+            else:
+                response = self._session.post(
+                    self._vitals_url,
+                    json=payload,
+                    timeout=10
+                )
             
             if response.status_code == 200:
                 result = response.json()
@@ -12,7 +12,7 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 from backend.app.services.nlp.language_detector import language_detector
 from backend.app.services.nlp.translator import translation_service
 from backend.app.services.nlp.symptom_extractor import symptom_extractor
-from backend.app.services.symptom_analyzer.analyzer import symptom_analyzer
+from backend.app.services.symptom_analyzer.analyzer import get_symptom_analyzer
 from backend.app.models.schemas import VitalsReading
 
 
@@ -37,7 +37,7 @@ def test_nlp_pipeline():
     for s in symptoms:
         print(f"  - {s.name} (severity: {s.severity}, duration: {s.duration})")
     
-    diagnosis = symptom_analyzer.analyze(symptoms)
+    diagnosis = get_symptom_analyzer().analyze(symptoms)
     print(f"\nDiagnosis:")
     print(f"  Urgency: {diagnosis.urgency_level}")
     print(f"  Conditions: {', '.join(diagnosis.possible_conditions)}")
@@ -68,7 +68,7 @@ def test_nlp_pipeline():
         temperature=101.5
     )
     
-    diagnosis2 = symptom_analyzer.analyze(symptoms2, vitals)
+    diagnosis2 = get_symptom_analyzer().analyze(symptoms2, vitals)
     print(f"\nDiagnosis (with vitals):")
     print(f"  Urgency: {diagnosis2.urgency_level}")
     print(f"  Confidence: {diagnosis2.confidence:.2f}")
@@ -93,7 +93,7 @@ def test_nlp_pipeline():
         temperature=98.6
     )
     
-    diagnosis3 = symptom_analyzer.analyze(symptoms3, vitals_emergency)
+    diagnosis3 = get_symptom_analyzer().analyze(symptoms3, vitals_emergency)
     print(f"\nDiagnosis:")
     print(f"  Urgency: {diagnosis3.urgency_level} ⚠️")
     print(f"  Emergency Contact: {diagnosis3.emergency_contact}")
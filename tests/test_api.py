@@ -1,11 +1,22 @@
 import pytest
 from fastapi.testclient import TestClient
+from app.config import settings
 from app.main import app
 
-client = TestClient(app)
 
+@pytest.fixture(scope="session")
+def client():
+    """One client (and one app startup) shared by every test"""
+    # No Edge TTS network call from the test run
+    warmup, settings.TTS_WARMUP = settings.TTS_WARMUP, False
+    try:
+        with TestClient(app) as c:
+            yield c
+    finally:
+        settings.TTS_WARMUP = warmup
 
-def test_root_endpoint():
+
+def test_root_endpoint(client):
     """Test root endpoint returns app information"""
     response = client.get("/")
     assert response.status_code == 200
@@ -15,7 +26,7 @@ def test_root_endpoint():
     assert data["status"] == "running"
 
 
-def test_health_check():
+def test_health_check(client):
     """Test health check endpoint"""
     response = client.get("/api/v1/health")
     assert response.status_code == 200
@@ -25,7 +36,7 @@ def test_health_check():
     assert "timestamp" in data
 
 
-def test_create_user():
+def test_create_user(client):
     """Test user creation"""
     user_data = {
         "phone": "+919999999999",
@@ -39,7 +50,7 @@ def test_create_user():
     assert response.status_code in [200, 500]  # Allow DB connection error
 
 
-def test_start_conversation():
+def test_start_conversation(client):
     """Test starting a conversation"""
     request_data = {
         "user_id": "+919999999999",
@@ -49,7 +60,7 @@ def test_start_conversation():
     assert response.status_code in [200, 500]  # Allow DB connection error
 
 
-def test_submit_vitals():
+def test_submit_vitals(client):
     """Test submitting vitals"""
     vitals_data = {
         "user_id": "+919999999999",
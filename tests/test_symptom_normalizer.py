@@ -0,0 +1,23 @@
+import pytest
+from app.services.symptom_normalizer import symptom_normalizer
+
+
+@pytest.mark.parametrize("message, symptom", [
+    ("chest pains", "chest pain"),
+    ("leg pains", "leg pain"),
+    ("ear pains", "ear pain"),
+])
+def test_plural_multi_word_symptoms_match(message, symptom):
+    """A multi-word symptom is found in its plural form"""
+    _, symptoms = symptom_normalizer.normalize(message)
+    assert symptom in symptoms
+
+
+@pytest.mark.parametrize("message, symptom", [
+    ("I filled up with gasoline", "gas"),
+    ("my sar dardy friend", "headache"),
+])
+def test_symptom_inside_longer_word_does_not_match(message, symptom):
+    """A variation that is only part of another word is not a hit"""
+    _, symptoms = symptom_normalizer.normalize(message)
+    assert symptom not in symptoms
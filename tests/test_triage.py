@@ -0,0 +1,37 @@
+import pytest
+from app.services.triage_service import analyze_message
+
+
+@pytest.mark.parametrize("message, level, condition", [
+    ("I have chest pains and sweating", "emergency", "Possible Heart Attack"),
+    ("severe headaches", "urgent", "Severe Headache"),
+    ("tumors in my breast", "doctor_soon", "Possible Tumor/Cancer Concern"),
+    ("lumps in neck", "doctor_soon", "Possible Tumor/Cancer Concern"),
+    ("masses in my abdomen", "doctor_soon", "Possible Tumor/Cancer Concern"),
+])
+def test_inflected_phrases_still_match(message, level, condition):
+    """Plural forms of triage phrases are classified like the phrase itself"""
+    triage = analyze_message(message)["triage"]
+    assert triage["level"] == level
+    assert triage["detected_condition"] == condition
+
+
+@pytest.mark.parametrize("message", [
+    "shivering all night",   # 'hiv'
+    "I got a massage",       # 'mass'
+    "I have prediabetes",    # 'diabetes'
+    "I have hives",          # 'hiv' + 'es'
+])
+def test_phrase_inside_longer_word_does_not_match(message):
+    """A triage phrase that is only part of another word is not a hit"""
+    triage = analyze_message(message)["triage"]
+    assert triage["level"] == "self_care"
+
+
+def test_cached_result_is_read_only():
+    """Results are shared between callers, so none of their parts can be mutated"""
+    analysis = analyze_message("I feel anxious and worried all the time")
+    with pytest.raises(TypeError):
+        analysis["triage"]["level"] = "emergency"
+    with pytest.raises(AttributeError):
+        analysis["mental_health"]["categories"].append("crisis")